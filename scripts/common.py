@@ -6,9 +6,17 @@ import mimetypes
 import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+# Optional: orjson for faster JSON parsing/encoding (output is byte-identical to the stdlib path)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 CATALOG_PATH = Path("data/meta/catalog.json")
 SCHEMA_PATH = Path("data/meta/schema.json")
 DATA_META_DIR = Path("data/meta")
@@ -24,22 +32,41 @@ def utc_now_iso() -> str:
 def load_json(path: Path, default: Any) -> Any:
     if not path.exists():
         return default
-    return json.loads(path.read_text(encoding="utf-8"))
+    # One read and a parse straight from bytes; no text-mode decoding layer.
+    data = path.read_bytes()
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the stdlib parser handle (or report) what orjson rejects, e.g. NaN
+            pass
+    return json.loads(data)
 
 
 def write_json(path: Path, data: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if HAS_ORJSON:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        payload = orjson.dumps(data, option=options)
+    else:
+        payload = (json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8")
+    # Write a sibling temp file and rename it over the target, so an interrupted
+    # write never leaves a truncated catalog behind.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
+    # file_digest reads into one reusable buffer instead of allocating a bytes per chunk
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
+@lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
     cleaned = []
     for ch in text.lower():
@@ -77,6 +104,16 @@ def find_by_sha(entries: List[Dict[str, Any]], sha: str) -> Optional[Dict[str, A
     return None
 
 
+def index_by_sha(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Map sha256 -> entry for repeated lookups; like find_by_sha, the first entry wins."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        sha = entry.get("sha256")
+        if sha:
+            index.setdefault(sha, entry)
+    return index
+
+
 def ensure_sources(entry: Dict[str, Any], source_name: str, source_url: str) -> None:
     sources = entry.setdefault("sources", [])
     for item in sources:
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import codecs
 from html.parser import HTMLParser
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+import requests
+
+# Optional: lxml (libxml2) parses HTML several times faster than html.parser
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 
 class LinkCollector(HTMLParser):
     def __init__(self) -> None:
@@ -49,10 +59,74 @@ class LinkCollector(HTMLParser):
             self._current_link = None
 
 
+class LxmlLinkTarget:
+    """lxml parser target that drives LinkCollector's handlers, so both parsers share one set of rules.
+
+    libxml2 may report a text run in pieces; they are joined so each run reaches
+    handle_data whole, as with html.parser.
+    """
+
+    def __init__(self) -> None:
+        self.collector = LinkCollector()
+        self._data: List[str] = []
+
+    def _flush(self) -> None:
+        if self._data:
+            self.collector.handle_data("".join(self._data))
+            self._data = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self._flush()
+        self.collector.handle_starttag(tag, list(attrib.items()))
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        self.collector.handle_endtag(tag)
+
+    def data(self, data: str) -> None:
+        self._data.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def close(self) -> List[Dict[str, str]]:
+        self._flush()
+        return self.collector.links
+
+
+def _link_parser() -> Tuple[Callable[[str], None], Callable[[], List[Dict[str, str]]]]:
+    """feed and finish callables of a fresh link parser, lxml-backed when available."""
+    if HAS_LXML:
+        parser = etree.HTMLParser(target=LxmlLinkTarget())
+        return parser.feed, parser.close
+    collector = LinkCollector()
+    return collector.feed, lambda: collector.links
+
+
 def collect_links(html: str) -> List[Dict[str, str]]:
-    parser = LinkCollector()
-    parser.feed(html)
-    return parser.links
+    feed, finish = _link_parser()
+    feed(html)
+    return finish()
+
+
+def collect_links_stream(resp: requests.Response, chunk_size: int = 65536) -> List[Dict[str, str]]:
+    """collect_links for a response opened with stream=True.
+
+    The body is parsed as it arrives rather than buffered whole as resp.text.
+    It is decoded with resp.encoding, falling back to UTF-8 instead of guessing a charset.
+    """
+    decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+    feed, finish = _link_parser()
+    pending = ""
+    for chunk in resp.iter_content(chunk_size):
+        pending += decoder.decode(chunk)
+        # Feed up to the last tag start, so a text run (e.g. a heading) is never split across feeds
+        cut = pending.rfind("<")
+        if cut > 0:
+            feed(pending[:cut])
+            pending = pending[cut:]
+    feed(pending + decoder.decode(b"", final=True))
+    return finish()
 
 
 def normalize_url(base_url: str, href: str) -> str:
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Field cleaners shared by the fix_email_metadata* scripts.
+
+Patterns are compiled once here, so running several fix passes in one
+process (or importing them from a pipeline) only pays the compile cost once.
+Each cleaner has a matching is_clean_* predicate: a cheap, conservative check
+that the cleaner would return the value unchanged.
+"""
+from __future__ import annotations
+
+import re
+
+
+# Categories whose catalog entries carry email_* fields
+EMAIL_CATEGORIES = frozenset({"email", "correspondence"})
+# Value clean_field() uses for missing or unreadable fields
+NOT_VISIBLE = "[Not visible in document]"
+
+_PREFIX_RE = re.compile(r'^(From:|To:|Cc:|Bcc:|Sent:)\s*', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# Month patterns lead with a first-letter lookahead so the engine can skip
+# ahead to candidate positions instead of trying every alternative everywhere.
+_MONTH_DATE_TIME_RE = re.compile(r'(?=[jfmasond])\b(?:J(?:an|u[nl])|Feb|Ma[ry]|A(?:pr|ug)|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}\s+\d{1,2}:\d{2}\s*(?:AM|PM)?\b', re.IGNORECASE)
+_SLASH_DATE_TIME_RE = re.compile(r'\b\d{1,2}/\d{1,2}/\d{2,4}\s+\d{1,2}:\d{2}\s*(?:AM|PM)?\b')
+_CIPHER_RE = re.compile(r'\bcipher\s+\d+\b', re.IGNORECASE)
+
+_YEAR_TIME_RE = re.compile(r',?\s*\d{4}\s+\d{1,2}:\d{2}\s*(?:AM|PM)?')
+_CIPHER_DATE_RE = re.compile(r'\b(?:cipher)\s+\d+,?\s*', re.IGNORECASE)
+_MONTH_DATE_RE = re.compile(r'(?=[jfmasond])\b(?:J(?:an|u[nl])|Feb|Ma[ry]|A(?:pr|ug)|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}\b', re.IGNORECASE)
+_SLASH_DATE_RE = re.compile(r'\b\d{1,2}/\d{1,2}/\d{2,4}\b')
+_JUNK_LEAD_RE = re.compile(r'^[,\.\-\s]+')
+_PUNCT_ONLY_RE = re.compile(r'^[\(\)\[\],\.\;\:\-\s]+$')
+
+# Literal prefilters for the date/cipher patterns, checked against casefolded text.
+# 'pher' rather than 'cipher' because IGNORECASE also lets 'ı'/'İ' match 'i'.
+_MONTH_PREFIXES = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+_CIPHER_HINT = 'pher'
+# Characters _PUNCT_ONLY_RE accepts once whitespace is normalized to single spaces
+_PUNCT_CHARS = frozenset('()[],.;:- ')
+
+
+def _is_normalized(value: str, min_len: int, max_len: int) -> bool:
+    """Shared part of the is_clean_* predicates."""
+    return (
+        isinstance(value, str)
+        and min_len <= len(value) <= max_len
+        and value != "N/A"
+        and ':' not in value
+        and value == ' '.join(value.split())
+    )
+
+
+def clean_email_field(raw_value: str) -> str:
+    """
+    Clean up email From/To fields by removing OCR noise and normalizing.
+
+    Common issues:
+    - "Sent: cipher 10, 2018 4:37 PM" instead of just sender
+    - "subooena.criminai" instead of "subpoena-criminal@amazon.com"
+    - Extra whitespace, newlines, formatting artifacts
+    """
+    if not raw_value or raw_value == "N/A":
+        return ""
+
+    # Remove common prefixes that leak into the field
+    raw_value = _PREFIX_RE.sub('', raw_value)
+
+    # Remove date/time patterns that leak in; both include a clock time, so
+    # fields without ':' (most of them) can skip the regexes
+    if ':' in raw_value:
+        raw_value = _MONTH_DATE_TIME_RE.sub('', raw_value)
+        if '/' in raw_value:
+            raw_value = _SLASH_DATE_TIME_RE.sub('', raw_value)
+
+    # Remove "cipher" and other OCR artifacts
+    if _CIPHER_HINT in raw_value.casefold():
+        raw_value = _CIPHER_RE.sub('', raw_value)
+
+    # Clean up whitespace
+    raw_value = _WS_RE.sub(' ', raw_value).strip()
+
+    # If it's just punctuation or too short, return empty
+    if len(raw_value) < 3 or raw_value in ('(', ')', '[', ']', 'Cc:', 'Bcc:'):
+        return ""
+
+    # Limit length (prevent huge blocks)
+    if len(raw_value) > 200:
+        raw_value = raw_value[:200] + "..."
+
+    return raw_value
+
+
+def is_clean_email_field(value: str) -> bool:
+    """True if clean_email_field(value) would return value unchanged."""
+    return _is_normalized(value, 3, 200) and not any(ch.isdigit() for ch in value)
+
+
+def clean_email_field_aggressive(raw_value: str) -> str:
+    """
+    Aggressively clean email From/To fields.
+
+    Common issues to fix:
+    - ", 2018 4:37 PM" → ""
+    - "Sent: cipher 10, 2018 4:37 PM" → ""
+    - "subooena.criminai" → keep as-is (OCR error but valid)
+    - "(USMS)'" → keep as-is
+    - Empty/whitespace only → ""
+    """
+    if not raw_value or raw_value == "N/A":
+        return ""
+
+    # Remove leading/trailing whitespace
+    raw_value = raw_value.strip()
+
+    # Remove common prefixes
+    raw_value = _PREFIX_RE.sub('', raw_value)
+
+    # Remove date/time and cipher patterns that leak in. Every one of them needs
+    # a digit, and most fields are plain names, so check cheap literals first.
+    if any(ch.isdigit() for ch in raw_value):
+        # Pattern: ", 2018 4:37 PM" or "cipher 10, 2018 4:37 PM"
+        if ':' in raw_value:
+            raw_value = _YEAR_TIME_RE.sub('', raw_value)
+        if _CIPHER_HINT in raw_value.casefold():
+            raw_value = _CIPHER_DATE_RE.sub('', raw_value)
+
+        # Remove full date patterns
+        folded = raw_value.casefold()
+        if any(month in folded for month in _MONTH_PREFIXES):
+            raw_value = _MONTH_DATE_RE.sub('', raw_value)
+        if '/' in raw_value:
+            raw_value = _SLASH_DATE_RE.sub('', raw_value)
+
+    # Clean up whitespace
+    raw_value = _WS_RE.sub(' ', raw_value).strip()
+
+    # If it starts with just a comma or punctuation, remove it
+    raw_value = _JUNK_LEAD_RE.sub('', raw_value)
+
+    # If too short or just punctuation, return empty
+    if len(raw_value) < 2:
+        return ""
+
+    # If it's JUST punctuation, return empty
+    if _PUNCT_ONLY_RE.match(raw_value):
+        return ""
+
+    # Limit length
+    if len(raw_value) > 150:
+        raw_value = raw_value[:147] + "..."
+
+    return raw_value
+
+
+def is_clean_email_field_aggressive(value: str) -> bool:
+    """True if clean_email_field_aggressive(value) would return value unchanged."""
+    return (
+        _is_normalized(value, 2, 150)
+        and value[0] not in ',.-'
+        and not any(ch.isdigit() for ch in value)
+        and not _PUNCT_CHARS.issuperset(value)
+    )
+
+
+def clean_field(value: str) -> str:
+    """Clean and normalize field value."""
+    if not value or value in ["", "N/A"]:
+        return NOT_VISIBLE
+
+    # Remove common OCR artifacts
+    value = _WS_RE.sub(' ', value).strip()
+
+    # Fix garbled patterns
+    if value in ["From:", "To:", "Cc:", "Sent:", "Subject:"]:
+        return NOT_VISIBLE
+
+    # If very short and looks garbled
+    if len(value) < 3:
+        return NOT_VISIBLE
+
+    # Limit length
+    if len(value) > 150:
+        value = value[:147] + "..."
+
+    return value
+
+
+def is_clean_field(value: str) -> bool:
+    """True if clean_field(value) would return value unchanged."""
+    return _is_normalized(value, 3, 150)
@@ -12,12 +12,15 @@ AUTONOMOUS-PLAN Phase 1: Upgrade OCR Pipeline
 from __future__ import annotations
 
 import os
+import shutil
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     from PIL import Image, ImageEnhance, ImageFilter
     HAS_OCR = True
 except ImportError:
@@ -31,6 +34,21 @@ try:
 except ImportError:
     HAS_SCIPY = False
 
+# Optional: OpenCV for array-based preprocessing (avoids PIL copies per step)
+try:
+    import cv2
+    import numpy as np
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+if HAS_CV2:
+    # Same kernels as PIL's ImageFilter.SHARPEN and ImageFilter.SMOOTH
+    _SHARPEN_KERNEL = np.array([[-2, -2, -2], [-2, 32, -2], [-2, -2, -2]], dtype=np.float32) / 16
+    _SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+    _IDENTITY_KERNEL = np.zeros((3, 3), dtype=np.float32)
+    _IDENTITY_KERNEL[1, 1] = 1.0
+
 
 def detect_skew(image: Image.Image) -> float:
     """
@@ -59,6 +77,9 @@ def preprocess_image(image: Image.Image, strategy: str = 'default') -> Image.Ima
     Returns:
         Preprocessed image
     """
+    if HAS_CV2:
+        return _preprocess_array(image, strategy)
+
     if strategy == 'high_contrast':
         # Increase contrast for low-contrast documents
         enhancer = ImageEnhance.Contrast(image)
@@ -83,6 +104,37 @@ def preprocess_image(image: Image.Image, strategy: str = 'default') -> Image.Ima
     return image
 
 
+def _preprocess_array(image: Image.Image, strategy: str) -> Image.Image:
+    """
+    OpenCV equivalent of the PIL preprocessing chain.
+
+    Works on a single grayscale uint8 array in place (Tesseract binarizes
+    grayscale anyway) and converts back to PIL once at the end.
+    """
+    arr = np.array(image.convert('L'))
+
+    if strategy == 'high_contrast':
+        _enhance_contrast(arr, 2.0)
+        cv2.filter2D(arr, -1, _SHARPEN_KERNEL, dst=arr)
+
+    elif strategy == 'denoise':
+        cv2.medianBlur(arr, 3, dst=arr)
+        # ImageEnhance.Sharpness: blend the image away from its smoothed version
+        cv2.filter2D(arr, -1, 1.5 * _IDENTITY_KERNEL - 0.5 * _SMOOTH_KERNEL, dst=arr)
+
+    else:  # default
+        _enhance_contrast(arr, 1.3)
+        cv2.filter2D(arr, -1, _SHARPEN_KERNEL, dst=arr)
+
+    return Image.fromarray(arr)
+
+
+def _enhance_contrast(arr: "np.ndarray", factor: float) -> None:
+    """ImageEnhance.Contrast on a grayscale array: scale around the mean, saturating."""
+    mean = int(arr.mean() + 0.5)
+    cv2.addWeighted(arr, factor, arr, 0.0, mean * (1.0 - factor), dst=arr)
+
+
 def determine_adaptive_dpi(pdf_path: Path) -> int:
     """
     Determine optimal DPI based on file size heuristic.
@@ -108,11 +160,171 @@ def determine_adaptive_dpi(pdf_path: Path) -> int:
         return 200
 
 
+def min_token_confidence() -> float:
+    """Tokens below this Tesseract confidence are dropped as scan noise (EPPIE_OCR_MIN_CONFIDENCE)."""
+    return float(os.getenv("EPPIE_OCR_MIN_CONFIDENCE", "50"))
+
+
+def _pages_from_words(
+    words: Iterable[Tuple[int, int, int, int, float, str]],
+    page_count: int,
+    min_conf: float,
+) -> List[Tuple[str, float, int]]:
+    """
+    Rebuild per-page text from Tesseract word rows, dropping low-confidence tokens.
+
+    Args:
+        words: (page_idx, block_num, par_num, line_num, conf, text) word rows
+        page_count: Number of pages that were OCR'd
+        min_conf: Minimum word confidence to keep a token
+
+    Returns:
+        List of (page_text, confidence, dropped_tokens) tuples, one per page.
+        Confidence is the mean over all recognized words, before filtering.
+    """
+    lines_by_page: List[Dict[Tuple[int, int, int], List[str]]] = [{} for _ in range(page_count)]
+    confs_by_page: List[List[float]] = [[] for _ in range(page_count)]
+    dropped_by_page = [0] * page_count
+
+    for page_idx, block, par, line, conf, word in words:
+        word = word.strip()
+        if not word or not 0 <= page_idx < page_count:
+            continue
+        if conf >= 0:
+            confs_by_page[page_idx].append(conf)
+        if conf < min_conf:
+            dropped_by_page[page_idx] += 1
+            continue
+        lines_by_page[page_idx].setdefault((block, par, line), []).append(word)
+
+    pages = []
+    for lines, confs, dropped in zip(lines_by_page, confs_by_page, dropped_by_page):
+        text_lines = []
+        prev_block = None
+        for (block, par, _), line_words in lines.items():
+            if prev_block is not None and (block, par) != prev_block:
+                text_lines.append('')
+            text_lines.append(' '.join(line_words))
+            prev_block = (block, par)
+        conf = sum(confs) / len(confs) if confs else 0.0
+        pages.append(('\n'.join(text_lines), conf, dropped))
+    return pages
+
+
+def parse_tesseract_tsv(
+    tsv: str, page_count: int, min_conf: float = 0.0
+) -> List[Tuple[str, float, int]]:
+    """
+    Rebuild per-page text and mean word confidence from tesseract TSV output.
+
+    Args:
+        tsv: TSV output from a (possibly multi-image) tesseract run
+        page_count: Number of pages that were OCR'd
+        min_conf: Minimum word confidence to keep a token
+
+    Returns:
+        List of (page_text, confidence, dropped_tokens) tuples, one per page
+    """
+    def word_rows():
+        for row in tsv.splitlines()[1:]:
+            cols = row.split('\t')
+            # level, page_num, block_num, par_num, line_num, word_num, left, top, width, height, conf, text
+            if len(cols) < 12 or cols[0] != '5':
+                continue
+            yield int(cols[1]) - 1, int(cols[2]), int(cols[3]), int(cols[4]), float(cols[10]), cols[11]
+
+    return _pages_from_words(word_rows(), page_count, min_conf)
+
+
+def ocr_pages_batch(
+    images: List[Image.Image], lang: str = 'eng+deu', min_conf: float = 0.0
+) -> Optional[List[Tuple[str, float, int]]]:
+    """
+    OCR many page images with a single tesseract process via an image list file.
+
+    Amortizes tesseract startup and language model loading over all pages.
+
+    Returns:
+        List of (page_text, confidence, dropped_tokens) tuples, or None if the
+        tesseract binary is unavailable or the batch run fails
+    """
+    tesseract = shutil.which(pytesseract.pytesseract.tesseract_cmd)
+    if not tesseract or not images:
+        return None
+
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            page_paths = []
+            for i, image in enumerate(images):
+                page_path = Path(tmpdir) / f"page-{i:05d}.png"
+                image.save(page_path)
+                page_paths.append(str(page_path))
+            list_path = Path(tmpdir) / "pages.txt"
+            list_path.write_text("\n".join(page_paths) + "\n", encoding="utf-8")
+
+            result = subprocess.run(
+                [tesseract, str(list_path), "-", "-l", lang, "tsv"],
+                check=True,
+                capture_output=True,
+            )
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Batch tesseract failed, falling back to per-page OCR: {e}")
+        return None
+
+    return parse_tesseract_tsv(result.stdout.decode("utf-8", errors="ignore"), len(images), min_conf)
+
+
+def _ocr_page(processed: Image.Image, min_conf: float = 0.0) -> Tuple[str, float, int]:
+    """OCR a single page through pytesseract (fallback when batch mode is unavailable)."""
+    # Apply Tesseract with language hints (English + German for names)
+    try:
+        # Word-level OCR data gives both the text and its confidence in one pass
+        data = pytesseract.image_to_data(
+            processed,
+            lang='eng+deu',  # English + German for proper names
+            output_type=pytesseract.Output.DICT
+        )
+        words = (
+            (0, data['block_num'][i], data['par_num'][i], data['line_num'][i], float(data['conf'][i]), str(data['text'][i]))
+            for i in range(len(data['text']))
+            if data['level'][i] == 5
+        )
+        return _pages_from_words(words, 1, min_conf)[0]
+    
+    except Exception as e:
+        # Fallback to basic OCR if detailed fails
+        page_text = pytesseract.image_to_string(processed, lang='eng')
+        return page_text, 50.0, 0  # Default confidence
+
+
+def iter_page_chunks(
+    pdf_path: Path, dpi: int, max_pages: Optional[int] = None, chunk_size: int = 10
+) -> Iterator[List[Image.Image]]:
+    """
+    Yield rendered PDF pages in chunks of at most chunk_size images.
+
+    A 300 dpi page is ~30MB as an RGB image, so rendering a long PDF in one
+    convert_from_path call can exhaust memory; chunks of 10 keep most of the
+    speed with bounded memory.
+    """
+    page_count = int(pdfinfo_from_path(str(pdf_path))["Pages"])
+    if max_pages:
+        page_count = min(page_count, max_pages)
+
+    for first_page in range(1, page_count + 1, chunk_size):
+        yield convert_from_path(
+            str(pdf_path),
+            first_page=first_page,
+            last_page=min(first_page + chunk_size - 1, page_count),
+            dpi=dpi
+        )
+
+
 def apply_enhanced_ocr(
     pdf_path: Path,
     max_pages: Optional[int] = None,
     strategies: List[str] = None
-) -> Tuple[str, float]:
+) -> Tuple[str, float, int]:
     """
     Apply enhanced OCR with preprocessing and adaptive settings.
     
@@ -122,10 +334,11 @@ def apply_enhanced_ocr(
         strategies: Preprocessing strategies to try (default: ['default'])
     
     Returns:
-        Tuple of (extracted_text, confidence_score)
+        Tuple of (extracted_text, confidence_score, dropped_token_count).
+        Tokens below EPPIE_OCR_MIN_CONFIDENCE (default 50) are dropped.
     """
     if not HAS_OCR:
-        return "", 0.0
+        return "", 0.0, 0
     
     if strategies is None:
         strategies = ['default']
@@ -134,64 +347,30 @@ def apply_enhanced_ocr(
     dpi = determine_adaptive_dpi(pdf_path)
     
     try:
-        # Convert PDF pages to images
-        if max_pages:
-            images = convert_from_path(
-                str(pdf_path),
-                first_page=1,
-                last_page=max_pages,
-                dpi=dpi
-            )
-        else:
-            images = convert_from_path(
-                str(pdf_path),
-                dpi=dpi
-            )
-        
         # Try multiple preprocessing strategies, keep best result
         best_text = ""
         best_confidence = 0.0
-        
+        best_dropped = 0
+        min_conf = min_token_confidence()
+        strategy_pages: Dict[str, List[Tuple[str, float, int]]] = {strategy: [] for strategy in strategies}
+
+        # Render a few pages at a time so peak memory stays at one chunk, not the whole PDF
+        for images in iter_page_chunks(pdf_path, dpi=dpi, max_pages=max_pages):
+            for strategy in strategies:
+                processed = [preprocess_image(image, strategy=strategy) for image in images]
+
+                # One tesseract process per chunk; per-page pytesseract if unavailable
+                pages = ocr_pages_batch(processed, lang='eng+deu', min_conf=min_conf)  # English + German for proper names
+                if pages is None:
+                    pages = [_ocr_page(image, min_conf) for image in processed]
+                strategy_pages[strategy].extend(pages)
+            del images
+
         for strategy in strategies:
-            texts = []
-            confidences = []
-            
-            for image in images:
-                # Preprocess image
-                processed = preprocess_image(image, strategy=strategy)
-                
-                # Apply Tesseract with language hints (English + German for names)
-                try:
-                    # Get detailed OCR data with confidence
-                    data = pytesseract.image_to_data(
-                        processed,
-                        lang='eng+deu',  # English + German for proper names
-                        output_type=pytesseract.Output.DICT
-                    )
-                    
-                    # Extract text
-                    page_text = pytesseract.image_to_string(
-                        processed,
-                        lang='eng+deu'
-                    )
-                    texts.append(page_text)
-                    
-                    # Calculate average confidence for this page
-                    confidences_list = [
-                        int(conf) for conf in data['conf'] 
-                        if conf != '-1'
-                    ]
-                    if confidences_list:
-                        page_conf = sum(confidences_list) / len(confidences_list)
-                        confidences.append(page_conf)
-                    else:
-                        confidences.append(0.0)
-                
-                except Exception as e:
-                    # Fallback to basic OCR if detailed fails
-                    page_text = pytesseract.image_to_string(processed, lang='eng')
-                    texts.append(page_text)
-                    confidences.append(50.0)  # Default confidence
+            pages = strategy_pages[strategy]
+            texts = [text for text, _, _ in pages]
+            confidences = [conf for _, conf, _ in pages]
+            dropped = sum(count for _, _, count in pages)
             
             # Combine results
             strategy_text = "\n\n".join(texts)
@@ -201,12 +380,13 @@ def apply_enhanced_ocr(
             if strategy_confidence > best_confidence:
                 best_text = strategy_text
                 best_confidence = strategy_confidence
+                best_dropped = dropped
         
-        return best_text, best_confidence
+        return best_text, best_confidence, best_dropped
     
     except Exception as e:
         print(f"Enhanced OCR failed for {pdf_path.name}: {e}")
-        return "", 0.0
+        return "", 0.0, 0
 
 
 def apply_ocr_with_fallback(pdf_path: Path, max_pages: int = 5) -> str:
@@ -224,7 +404,7 @@ def apply_ocr_with_fallback(pdf_path: Path, max_pages: int = 5) -> str:
         Extracted text from OCR
     """
     # Try enhanced OCR with multiple strategies
-    text, confidence = apply_enhanced_ocr(
+    text, confidence, _ = apply_enhanced_ocr(
         pdf_path,
         max_pages=max_pages,
         strategies=['default', 'high_contrast', 'denoise']
@@ -233,14 +413,10 @@ def apply_ocr_with_fallback(pdf_path: Path, max_pages: int = 5) -> str:
     # If low confidence or empty, try basic OCR
     if confidence < 50.0 or not text.strip():
         try:
-            from pdf2image import convert_from_path
-            images = convert_from_path(
-                str(pdf_path),
-                first_page=1,
-                last_page=max_pages,
-                dpi=200
-            )
-            texts = [pytesseract.image_to_string(img, lang='eng') for img in images]
+            texts = []
+            for images in iter_page_chunks(pdf_path, dpi=200, max_pages=max_pages):
+                texts.extend(pytesseract.image_to_string(img, lang='eng') for img in images)
+                del images
             text = "\n\n".join(texts)
         except Exception:
             pass
@@ -1,20 +1,20 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
 import os
 import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from pdfminer.high_level import extract_text
-
 from scripts.common import (
     DATA_META_DIR,
     DERIVED_INDEX_DIR,
     DERIVED_TEXT_DIR,
     load_catalog,
+    load_json,
     slugify,
     utc_now_iso,
     write_json,
@@ -26,6 +26,25 @@ from scripts.email_metadata import extract_email_metadata, is_epstein_email
 
 MAX_CONTENT_CHARS = 20000
 TEXT_EXTENSIONS = {".txt", ".rtf", ".csv"}
+# Resolved once per process instead of scanning $PATH for every PDF
+PDFTOTEXT = shutil.which("pdftotext")
+# Catalog fields set by PDF analysis; entries missing any of them are (re)analyzed
+ANALYSIS_FIELDS = (
+    "pdf_type",
+    "has_extractable_text",
+    "ocr_applied",
+    "text_quality_score",
+    "file_size_bytes",
+    "extracted_file_numbers",
+    "extracted_dates",
+    "document_category",
+    # Phase 1 fields - require re-analysis if missing
+    "person_names",
+    "locations",
+    "case_numbers",
+)
+EMAIL_CATEGORIES = ("email", "correspondence")
+EMAIL_FIELDS = ("email_from", "email_to", "email_subject")
 
 
 def extract_pdf_text(pdf_path: Path, output_path: Path) -> Optional[str]:
@@ -36,14 +55,19 @@ def extract_pdf_text(pdf_path: Path, output_path: Path) -> Optional[str]:
         Extracted text or None on failure
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    pdftotext = shutil.which("pdftotext")
     try:
-        if pdftotext:
-            subprocess.run(
-                [pdftotext, "-layout", str(pdf_path), str(output_path)],
+        if PDFTOTEXT:
+            # Read text from stdout rather than re-reading the file pdftotext wrote
+            result = subprocess.run(
+                [PDFTOTEXT, "-layout", str(pdf_path), "-"],
                 check=True,
+                capture_output=True,
             )
-            return output_path.read_text(encoding="utf-8", errors="ignore")
+            output_path.write_bytes(result.stdout)
+            return result.stdout.decode("utf-8", errors="ignore")
+        # pdfminer is slow to import; only load it when pdftotext is unavailable
+        from pdfminer.high_level import extract_text
+
         text = extract_text(str(pdf_path))
         output_path.write_text(text, encoding="utf-8")
         return text
@@ -53,6 +77,188 @@ def extract_pdf_text(pdf_path: Path, output_path: Path) -> Optional[str]:
         return ""
 
 
+def _source_mtime(file_path: Path, text_path: Path) -> Optional[float]:
+    try:
+        return max(file_path.stat().st_mtime, text_path.stat().st_mtime)
+    except OSError:
+        return None
+
+
+def _index_doc(entry: Dict[str, Any], content: str, mtime: Optional[float]) -> Dict[str, Any]:
+    return {
+        "id": entry["id"],
+        "title": entry["title"],
+        "release_date": entry.get("release_date", ""),
+        "tags": entry.get("tags", []),
+        "source_name": entry.get("source_name"),
+        "file_name": Path(entry.get("file_path", "")).name,
+        "content": content,
+        # Source/derived text mtime, used to skip unchanged entries on the next run
+        "mtime": mtime,
+        # Add enriched metadata to search index
+        "pdf_type": entry.get("pdf_type"),
+        "text_quality_score": entry.get("text_quality_score"),
+        "document_category": entry.get("document_category"),
+        "extracted_file_numbers": entry.get("extracted_file_numbers", []),
+        # Phase 2: Auto-tags for advanced search
+        "auto_tags": entry.get("auto_tags", []),
+        "person_names": entry.get("person_names", []),
+        "locations": entry.get("locations", []),
+        # Email metadata
+        "email_from": entry.get("email_from"),
+        "email_to": entry.get("email_to"),
+        "email_subject": entry.get("email_subject"),
+        "email_date": entry.get("email_date"),
+        "is_epstein_email": entry.get("is_epstein_email", False),
+    }
+
+
+def _shard_key(entry: Dict[str, Any]) -> tuple[str, str]:
+    source_name = entry.get("source_name", "Unknown")
+    source_slug = slugify(source_name)
+    release_date = entry.get("release_date", "")
+    year = release_date[:4] if release_date[:4].isdigit() else "unknown"
+    return source_slug, year
+
+
+def _shard_path(source_slug: str, year: str) -> str:
+    return str(Path("data/derived/index/shards") / source_slug / f"{year}.json")
+
+
+def _load_previous_shards() -> Dict[str, List[Dict[str, Any]]]:
+    """Load the shards written by the previous run, keyed by manifest path."""
+    manifest = load_json(DERIVED_INDEX_DIR / "manifest.json", {})
+    previous: Dict[str, List[Dict[str, Any]]] = {}
+    for shard in manifest.get("shards", []):
+        previous[shard["path"]] = load_json(Path(shard["path"]), [])
+    return previous
+
+
+def _process_entry(
+    entry: Dict[str, Any], enable_ocr: bool, force_reextract: bool
+) -> tuple[Dict[str, Any], Dict[str, Any], tuple[str, str], bool]:
+    """
+    Extract, analyze and index a single catalog entry.
+
+    Runs in a worker process, so it only touches files owned by this entry.
+
+    Returns:
+        Tuple of (updated_entry, index_doc, (source_slug, year), catalog_updated)
+    """
+    catalog_updated = False
+
+    file_path = Path(entry["file_path"])
+    text_path = DERIVED_TEXT_DIR / f"{entry['id']}.txt"
+    mime_type = entry.get("mime_type", "")
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".pdf":
+        # Prefer existing derived text (preserves OCR output and avoids expensive re-extract)
+        extracted_text: Optional[str] = None
+        if not force_reextract and text_path.exists():
+            extracted_text = text_path.read_text(encoding="utf-8", errors="ignore")
+
+        if extracted_text is None:
+            extracted_text = extract_pdf_text(file_path, text_path)
+
+        # Analyze PDF for metadata enrichment only when needed
+        has_analysis_fields = all(key in entry for key in ANALYSIS_FIELDS)
+
+        should_ocr = enable_ocr and (not entry.get("ocr_applied", False))
+        needs_analysis = force_reextract or (not has_analysis_fields) or should_ocr
+
+        if extracted_text is not None and needs_analysis:
+            analysis = analyze_pdf(file_path, extracted_text, enable_ocr=should_ocr)
+
+            # Update catalog entry with analysis results
+            if analysis:
+                entry["pdf_type"] = analysis["pdf_type"]
+                entry["has_extractable_text"] = analysis["has_extractable_text"]
+                entry["ocr_applied"] = analysis["ocr_applied"] or entry.get("ocr_applied", False)
+                entry["text_quality_score"] = analysis["text_quality_score"]
+                entry["file_size_bytes"] = analysis["file_size_bytes"]
+                entry["extracted_file_numbers"] = analysis["extracted_file_numbers"]
+                entry["extracted_dates"] = analysis["extracted_dates"]
+                entry["dates_iso8601"] = analysis.get("dates_iso8601", [])  # Normalized ISO8601 dates
+                # Preserve existing categorization if analysis can't classify.
+                # (OCR-driven re-extraction previously regressed categorization by overwriting with None.)
+                entry["document_category"] = analysis["document_category"] or entry.get("document_category")
+                # Phase 1 fields
+                entry["person_names"] = analysis.get("person_names", [])
+                entry["locations"] = analysis.get("locations", [])
+                entry["case_numbers"] = analysis.get("case_numbers", [])
+                if "ocr_confidence" in analysis:
+                    entry["ocr_confidence"] = analysis["ocr_confidence"]
+                catalog_updated = True
+
+                # If OCR was applied and produced better text, save it
+                if analysis.get("enhanced_text"):
+                    text_path.write_text(analysis["enhanced_text"], encoding="utf-8")
+                    print(f"[extract] Applied OCR to {file_path.name}")
+                
+                # Phase 2: Generate auto-tags
+                if extracted_text:
+                    auto_tags = generate_auto_tags(
+                        text=extracted_text,
+                        category=analysis.get("document_category"),
+                        person_names=analysis.get("person_names", []),
+                        locations=analysis.get("locations", []),
+                        release_date=entry.get("release_date"),
+                    )
+                    if auto_tags:
+                        entry["auto_tags"] = auto_tags
+                        print(f"[extract] Generated {len(auto_tags)} auto-tags for {file_path.name}")
+        
+        # Extract email metadata for email/correspondence documents
+        if extracted_text and entry.get("document_category") in EMAIL_CATEGORIES:
+            email_meta = extract_email_metadata(extracted_text)
+            if email_meta.get("from_addr") or email_meta.get("to_addr") or email_meta.get("subject"):
+                entry["email_from"] = email_meta.get("from_addr")
+                entry["email_to"] = email_meta.get("to_addr")
+                entry["email_subject"] = email_meta.get("subject")
+                entry["email_date"] = email_meta.get("date")
+                entry["is_epstein_email"] = is_epstein_email(email_meta, extracted_text)
+                catalog_updated = True
+                print(f"[extract] Extracted email metadata from {file_path.name}")
+    elif suffix in TEXT_EXTENSIONS or mime_type.startswith("text/"):
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        text_path.write_text(file_path.read_text(encoding="utf-8"), encoding="utf-8")
+    else:
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        text_path.write_text("", encoding="utf-8")
+
+    # Only the indexed prefix is needed; 4 bytes per char covers any UTF-8 sequence.
+    with text_path.open("rb") as f:
+        content = f.read(MAX_CONTENT_CHARS * 4).decode("utf-8", errors="ignore")[:MAX_CONTENT_CHARS]
+
+    doc = _index_doc(entry, content, _source_mtime(file_path, text_path))
+    return entry, doc, _shard_key(entry), catalog_updated
+
+
+def _needs_processing(entry: Dict[str, Any], enable_ocr: bool) -> bool:
+    """True if _process_entry would change entry itself, not just re-read its text.
+
+    Covers the reasons it reprocesses PDFs: pending OCR, missing or failed analysis,
+    and email/correspondence entries without email metadata (for example after
+    recategorization, which changes the catalog but no file mtime).
+    """
+    if enable_ocr and not entry.get("ocr_applied", False):
+        return True
+    if Path(entry["file_path"]).suffix.lower() != ".pdf":
+        return False
+    if not all(key in entry for key in ANALYSIS_FIELDS):
+        return True
+    return entry.get("document_category") in EMAIL_CATEGORIES and not any(
+        entry.get(key) for key in EMAIL_FIELDS
+    )
+
+
+def _extract_workers(entry_count: int) -> int:
+    workers_env = os.getenv("EPPIE_EXTRACT_WORKERS")
+    workers = int(workers_env) if workers_env else (os.cpu_count() or 1)
+    return max(1, min(workers, entry_count))
+
+
 def extract_all() -> None:
     catalog = load_catalog()
     index_docs: List[Dict[str, Any]] = []
@@ -64,140 +270,43 @@ def extract_all() -> None:
     force_reextract = os.getenv("EPPIE_FORCE_REEXTRACT", "0") == "1"
 
     catalog_updated = False
+    previous_shards = {} if force_reextract else _load_previous_shards()
+    cached_docs = {doc["id"]: doc for docs in previous_shards.values() for doc in docs}
 
-    for entry in catalog:
-        file_path = Path(entry["file_path"])
-        text_path = DERIVED_TEXT_DIR / f"{entry['id']}.txt"
-        mime_type = entry.get("mime_type", "")
-        suffix = file_path.suffix.lower()
-
-        if suffix == ".pdf":
-            # Prefer existing derived text (preserves OCR output and avoids expensive re-extract)
-            extracted_text: Optional[str] = None
-            if not force_reextract and text_path.exists():
-                extracted_text = text_path.read_text(encoding="utf-8", errors="ignore")
-
-            if extracted_text is None:
-                extracted_text = extract_pdf_text(file_path, text_path)
-
-            # Analyze PDF for metadata enrichment only when needed
-            has_analysis_fields = all(
-                key in entry
-                for key in [
-                    "pdf_type",
-                    "has_extractable_text",
-                    "ocr_applied",
-                    "text_quality_score",
-                    "file_size_bytes",
-                    "extracted_file_numbers",
-                    "extracted_dates",
-                    "document_category",
-                    # Phase 1 fields - require re-analysis if missing
-                    "person_names",
-                    "locations",
-                    "case_numbers",
-                ]
-            )
+    results: List[Any] = [None] * len(catalog)
+    pending: List[int] = []
+    for i, entry in enumerate(catalog):
+        cached = cached_docs.get(entry["id"])
+        if cached is not None and not _needs_processing(entry, enable_ocr):
+            mtime = _source_mtime(Path(entry["file_path"]), DERIVED_TEXT_DIR / f"{entry['id']}.txt")
+            if mtime is not None and cached.get("mtime") == mtime:
+                # Unchanged since the last run: keep indexed content, refresh catalog metadata
+                results[i] = (entry, _index_doc(entry, cached["content"], mtime), _shard_key(entry), False)
+                continue
+        pending.append(i)
+
+    process = partial(_process_entry, enable_ocr=enable_ocr, force_reextract=force_reextract)
+    workers = _extract_workers(len(pending))
+    pending_entries = [catalog[i] for i in pending]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            processed = list(executor.map(process, pending_entries, chunksize=16))
+    else:
+        processed = [process(entry) for entry in pending_entries]
 
-            should_ocr = enable_ocr and (not entry.get("ocr_applied", False))
-            needs_analysis = force_reextract or (not has_analysis_fields) or should_ocr
-
-            if extracted_text is not None and needs_analysis:
-                analysis = analyze_pdf(file_path, extracted_text, enable_ocr=should_ocr)
-
-                # Update catalog entry with analysis results
-                if analysis:
-                    entry["pdf_type"] = analysis["pdf_type"]
-                    entry["has_extractable_text"] = analysis["has_extractable_text"]
-                    entry["ocr_applied"] = analysis["ocr_applied"] or entry.get("ocr_applied", False)
-                    entry["text_quality_score"] = analysis["text_quality_score"]
-                    entry["file_size_bytes"] = analysis["file_size_bytes"]
-                    entry["extracted_file_numbers"] = analysis["extracted_file_numbers"]
-                    entry["extracted_dates"] = analysis["extracted_dates"]
-                    entry["dates_iso8601"] = analysis.get("dates_iso8601", [])  # Normalized ISO8601 dates
-                    # Preserve existing categorization if analysis can't classify.
-                    # (OCR-driven re-extraction previously regressed categorization by overwriting with None.)
-                    entry["document_category"] = analysis["document_category"] or entry.get("document_category")
-                    # Phase 1 fields
-                    entry["person_names"] = analysis.get("person_names", [])
-                    entry["locations"] = analysis.get("locations", [])
-                    entry["case_numbers"] = analysis.get("case_numbers", [])
-                    if "ocr_confidence" in analysis:
-                        entry["ocr_confidence"] = analysis["ocr_confidence"]
-                    catalog_updated = True
-
-                    # If OCR was applied and produced better text, save it
-                    if analysis.get("enhanced_text"):
-                        text_path.write_text(analysis["enhanced_text"], encoding="utf-8")
-                        print(f"[extract] Applied OCR to {file_path.name}")
-                    
-                    # Phase 2: Generate auto-tags
-                    if extracted_text:
-                        auto_tags = generate_auto_tags(
-                            text=extracted_text,
-                            category=analysis.get("document_category"),
-                            person_names=analysis.get("person_names", []),
-                            locations=analysis.get("locations", []),
-                            release_date=entry.get("release_date"),
-                        )
-                        if auto_tags:
-                            entry["auto_tags"] = auto_tags
-                            print(f"[extract] Generated {len(auto_tags)} auto-tags for {file_path.name}")
-            
-            # Extract email metadata for email/correspondence documents
-            if extracted_text and entry.get("document_category") in ["email", "correspondence"]:
-                email_meta = extract_email_metadata(extracted_text)
-                if email_meta.get("from_addr") or email_meta.get("to_addr") or email_meta.get("subject"):
-                    entry["email_from"] = email_meta.get("from_addr")
-                    entry["email_to"] = email_meta.get("to_addr")
-                    entry["email_subject"] = email_meta.get("subject")
-                    entry["email_date"] = email_meta.get("date")
-                    entry["is_epstein_email"] = is_epstein_email(email_meta, extracted_text)
-                    catalog_updated = True
-                    print(f"[extract] Extracted email metadata from {file_path.name}")
-        elif suffix in TEXT_EXTENSIONS or mime_type.startswith("text/"):
-            text_path.parent.mkdir(parents=True, exist_ok=True)
-            text_path.write_text(file_path.read_text(encoding="utf-8"), encoding="utf-8")
-        else:
-            text_path.parent.mkdir(parents=True, exist_ok=True)
-            text_path.write_text("", encoding="utf-8")
-
-        content = text_path.read_text(encoding="utf-8", errors="ignore")
-        if len(content) > MAX_CONTENT_CHARS:
-            content = content[:MAX_CONTENT_CHARS]
-
-        doc = {
-            "id": entry["id"],
-            "title": entry["title"],
-            "release_date": entry.get("release_date", ""),
-            "tags": entry.get("tags", []),
-            "source_name": entry.get("source_name"),
-            "file_name": Path(entry.get("file_path", "")).name,
-            "content": content,
-            # Add enriched metadata to search index
-            "pdf_type": entry.get("pdf_type"),
-            "text_quality_score": entry.get("text_quality_score"),
-            "document_category": entry.get("document_category"),
-            "extracted_file_numbers": entry.get("extracted_file_numbers", []),
-            # Phase 2: Auto-tags for advanced search
-            "auto_tags": entry.get("auto_tags", []),
-            "person_names": entry.get("person_names", []),
-            "locations": entry.get("locations", []),
-            # Email metadata
-            "email_from": entry.get("email_from"),
-            "email_to": entry.get("email_to"),
-            "email_subject": entry.get("email_subject"),
-            "email_date": entry.get("email_date"),
-            "is_epstein_email": entry.get("is_epstein_email", False),
-        }
+    for i, result in zip(pending, processed):
+        results[i] = result
+    if cached_docs:
+        print(f"[extract] Reused {len(catalog) - len(pending)} unchanged documents")
+
+    for i, (entry, doc, shard_key, entry_updated) in enumerate(results):
+        # Workers return copies; put the enriched entry back in catalog order.
+        catalog[i] = entry
+        catalog_updated = catalog_updated or entry_updated
         index_docs.append(doc)
+        shards.setdefault(shard_key, []).append(doc)
 
-        source_name = entry.get("source_name", "Unknown")
-        source_slug = slugify(source_name)
-        release_date = entry.get("release_date", "")
-        year = release_date[:4] if release_date[:4].isdigit() else "unknown"
-        shards.setdefault((source_slug, year), []).append(doc)
-    
     # Save updated catalog if metadata was enriched
     if catalog_updated:
         catalog_path = DATA_META_DIR / "catalog.json"
@@ -218,15 +327,17 @@ def extract_all() -> None:
 
     for (source_slug, year), docs in sorted(shards.items()):
         shard_path = shards_dir / source_slug / f"{year}.json"
-        shard_path.parent.mkdir(parents=True, exist_ok=True)
-        write_json(shard_path, docs)
+        manifest_shard_path = _shard_path(source_slug, year)
+        if previous_shards.get(manifest_shard_path) != docs or not shard_path.exists():
+            shard_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(shard_path, docs)
         manifest["shards"].append(
             {
                 "source_slug": source_slug,
                 "source_name": docs[0]["source_name"] if docs else "Unknown",
                 "year": year,
                 "count": len(docs),
-                "path": str(Path("data/derived/index/shards") / source_slug / f"{year}.json"),
+                "path": manifest_shard_path,
             }
         )
 
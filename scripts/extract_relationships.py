@@ -10,10 +10,23 @@ Builds a relationship graph showing connections based on:
 from __future__ import annotations
 
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import combinations
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+# Optional: numpy/scipy for sparse co-occurrence counting
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+EMAIL_CATEGORIES = frozenset({'email', 'correspondence'})
+# Written by email_metadata.py / fix_email_metadata_complete.py for unreadable headers
+PLACEHOLDER_ADDRS = frozenset({'[Not visible in document]'})
+
 
 def extract_email_relationships(catalog: List[Dict]) -> List[Tuple[str, str, str]]:
     """
@@ -25,40 +38,64 @@ def extract_email_relationships(catalog: List[Dict]) -> List[Tuple[str, str, str
     relationships = []
     
     for doc in catalog:
-        if doc.get('document_category') not in ['email', 'correspondence']:
+        if doc.get('document_category') not in EMAIL_CATEGORIES:
             continue
         
         from_addr = doc.get('email_from')
         to_addr = doc.get('email_to')
         
-        if from_addr and to_addr:
-            # Skip placeholder values
-            if '[Not visible' not in from_addr and '[Not visible' not in to_addr:
-                relationships.append((from_addr, to_addr, 'email'))
+        # Skip missing and placeholder values
+        if (
+            from_addr and to_addr
+            and from_addr not in PLACEHOLDER_ADDRS
+            and to_addr not in PLACEHOLDER_ADDRS
+        ):
+            relationships.append((from_addr, to_addr, 'email'))
     
     return relationships
 
 
-def extract_co_mentions(catalog: List[Dict]) -> List[Tuple[str, str, str]]:
+def count_co_mentions(catalog: List[Dict]) -> Dict[Tuple[str, str], int]:
     """
-    Extract co-mention relationships (people mentioned in same document).
-    
+    Count co-mentions (people mentioned in same document).
+
+    Builds a sparse docs x people incidence matrix and computes all pair
+    counts with a single M.T @ M product when scipy is available; falls
+    back to per-document pair enumeration otherwise.
+
     Returns:
-        List of (person1, person2, relationship_type) tuples
+        Dict mapping (person1, person2) with person1 < person2 to the
+        number of documents mentioning both
     """
-    relationships = []
-    
-    for doc in catalog:
-        people = doc.get('person_names', [])
-        if len(people) < 2:
-            continue
-        
-        # Create relationships for all pairs
-        for i, person1 in enumerate(people):
-            for person2 in people[i+1:]:
-                relationships.append((person1, person2, 'co-mentioned'))
-    
-    return relationships
+    doc_people = [
+        sorted(set(doc.get('person_names') or []))
+        for doc in catalog
+    ]
+    doc_people = [people for people in doc_people if len(people) >= 2]
+    if not doc_people:
+        return {}
+
+    if not HAS_SCIPY:
+        counts: Counter = Counter()
+        for people in doc_people:
+            counts.update(combinations(people, 2))
+        return dict(counts)
+
+    names = sorted({name for people in doc_people for name in people})
+    vocab = {name: idx for idx, name in enumerate(names)}
+    rows = [doc_idx for doc_idx, people in enumerate(doc_people) for _ in people]
+    cols = [vocab[name] for people in doc_people for name in people]
+    matrix = csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(doc_people), len(names)),
+    )
+    co_occurrence = (matrix.T @ matrix).tocoo()
+
+    return {
+        (names[row], names[col]): int(weight)
+        for row, col, weight in zip(co_occurrence.row, co_occurrence.col, co_occurrence.data)
+        if row < col
+    }
 
 
 def build_relationship_graph(catalog: List[Dict]) -> Dict:
@@ -70,7 +107,7 @@ def build_relationship_graph(catalog: List[Dict]) -> Dict:
     """
     # Extract relationships
     email_rels = extract_email_relationships(catalog)
-    co_mention_rels = extract_co_mentions(catalog)
+    co_mention_counts = count_co_mentions(catalog)
     
     # Build graph
     nodes = set()
@@ -83,12 +120,12 @@ def build_relationship_graph(catalog: List[Dict]) -> Dict:
         edges[from_person][to_person] += 1
     
     # Add co-mention relationships
-    for person1, person2, rel_type in co_mention_rels:
+    for (person1, person2), count in co_mention_counts.items():
         nodes.add(person1)
         nodes.add(person2)
         # Bidirectional for co-mentions
-        edges[person1][person2] += 1
-        edges[person2][person1] += 1
+        edges[person1][person2] += count
+        edges[person2][person1] += count
     
     # Convert to serializable format
     graph = {
@@ -5,44 +5,13 @@ Fix email metadata extraction - clean up From/To fields and improve subject extr
 from __future__ import annotations
 
 import re
-from pathlib import Path
-import json
 
+from scripts.common import load_catalog, save_catalog
+from scripts.email_cleaners import EMAIL_CATEGORIES, clean_email_field, is_clean_email_field
 
-def clean_email_field(raw_value: str) -> str:
-    """
-    Clean up email From/To fields by removing OCR noise and normalizing.
-    
-    Common issues:
-    - "Sent: cipher 10, 2018 4:37 PM" instead of just sender
-    - "subooena.criminai" instead of "subpoena-criminal@amazon.com"
-    - Extra whitespace, newlines, formatting artifacts
-    """
-    if not raw_value or raw_value == "N/A":
-        return ""
-    
-    # Remove common prefixes that leak into the field
-    raw_value = re.sub(r'^(From:|To:|Cc:|Bcc:|Sent:)\s*', '', raw_value, flags=re.IGNORECASE)
-    
-    # Remove date/time patterns that leak in
-    raw_value = re.sub(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}\s+\d{1,2}:\d{2}\s*(?:AM|PM)?\b', '', raw_value, flags=re.IGNORECASE)
-    raw_value = re.sub(r'\b\d{1,2}/\d{1,2}/\d{2,4}\s+\d{1,2}:\d{2}\s*(?:AM|PM)?\b', '', raw_value)
-    
-    # Remove "cipher" and other OCR artifacts
-    raw_value = re.sub(r'\bcipher\s+\d+\b', '', raw_value, flags=re.IGNORECASE)
-    
-    # Clean up whitespace
-    raw_value = re.sub(r'\s+', ' ', raw_value).strip()
-    
-    # If it's just punctuation or too short, return empty
-    if len(raw_value) < 3 or raw_value in ('(', ')', '[', ']', 'Cc:', 'Bcc:'):
-        return ""
-    
-    # Limit length (prevent huge blocks)
-    if len(raw_value) > 200:
-        raw_value = raw_value[:200] + "..."
-    
-    return raw_value
+
+# "Name <email>" or "email [mailto:...]"; alternatives are tried in that order
+_NAME_RE = re.compile(r'^(?:([^<]+)\s*<[^>]+>$|([^\[]+)\s*\[mailto:)')
 
 
 def extract_name_from_email(email_str: str) -> str:
@@ -54,15 +23,11 @@ def extract_name_from_email(email_str: str) -> str:
     - "subpoena-criminal@amazon.com [mailto:...]" → "subpoena-criminal@amazon.com"
     - "Rodeb Teresa" → "Rodeb Teresa"
     """
-    # Pattern: Name <email>
-    match = re.match(r'^([^<]+)\s*<[^>]+>$', email_str)
-    if match:
-        return match.group(1).strip()
-    
-    # Pattern: email [mailto:email]
-    match = re.match(r'^([^\[]+)\s*\[mailto:', email_str)
+    # Pattern: Name <email>, or email [mailto:email]
+    match = _NAME_RE.match(email_str)
     if match:
-        return match.group(1).strip()
+        name = match.group(1) if match.group(1) is not None else match.group(2)
+        return name.strip()
     
     # Just return as-is if no special formatting
     return email_str.strip()
@@ -110,27 +75,23 @@ def improve_email_title(doc: dict) -> str:
 
 def main():
     """Fix email metadata for all email/correspondence documents."""
-    catalog_path = Path("data/meta/catalog.json")
-    
-    with open(catalog_path) as f:
-        catalog = json.load(f)
+    catalog = load_catalog()
     
     print("Fixing email metadata...")
     
+    emails = [doc for doc in catalog if doc.get("document_category") in EMAIL_CATEGORIES]
+    
     updated_count = 0
-    for doc in catalog:
-        if doc.get("document_category") not in ["email", "correspondence"]:
-            continue
-        
+    for doc in emails:
         # Clean up From field
-        if "email_from" in doc:
+        if "email_from" in doc and not is_clean_email_field(doc["email_from"]):
             cleaned_from = clean_email_field(doc["email_from"])
             if cleaned_from != doc["email_from"]:
                 doc["email_from"] = cleaned_from
                 updated_count += 1
         
         # Clean up To field  
-        if "email_to" in doc:
+        if "email_to" in doc and not is_clean_email_field(doc["email_to"]):
             cleaned_to = clean_email_field(doc["email_to"])
             if cleaned_to != doc["email_to"]:
                 doc["email_to"] = cleaned_to
@@ -142,14 +103,13 @@ def main():
         #     doc["title"] = new_title
         #     updated_count += 1
     
-    # Write updated catalog
-    with open(catalog_path, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    # Write updated catalog (skipped when nothing changed)
+    if updated_count:
+        save_catalog(catalog)
     
     print(f"✓ Cleaned email metadata for {updated_count} field updates")
     
     # Show sample
-    emails = [doc for doc in catalog if doc.get("document_category") in ["email", "correspondence"]]
     print(f"\nSample cleaned emails:")
     for doc in emails[:5]:
         print(f"\n{doc['title']}")
@@ -5,154 +5,120 @@ Comprehensive email metadata fix.
 - Fix OCR-garbled fields
 - Re-extract from text where possible
 """
-import json
 from pathlib import Path
-import re
+
+from scripts.common import load_catalog, save_catalog
+from scripts.email_cleaners import EMAIL_CATEGORIES, NOT_VISIBLE, clean_field, is_clean_field
+
+# Metadata key -> header labels in priority order
+HEADER_FIELDS = {
+    'from': ('from', 'sender'),
+    'to': ('to', 'recipient'),
+    'subject': ('subject', 're'),
+    'cc': ('cc',),
+}
+_HEADER_LABELS = frozenset(label for labels in HEADER_FIELDS.values() for label in labels)
+# Once every preferred label is seen, the remaining lines cannot change the result
+_PRIMARY_LABELS = frozenset(labels[0] for labels in HEADER_FIELDS.values())
+# Headers are only looked for at the top of the document
+HEADER_SCAN_CHARS = 2000
+# Catalog fields this script rewrites -> extract_email_metadata_from_text key
+EMAIL_FIELDS = {
+    "email_from": "from",
+    "email_to": "to",
+    "email_subject": "subject",
+    "email_cc": "cc",
+}
 
 def extract_email_metadata_from_text(text: str) -> dict:
-    """Extract email metadata from document text."""
-    metadata = {}
-    
-    # Common email header patterns
-    from_patterns = [
-        r'From:\s*([^\n]+)',
-        r'FROM:\s*([^\n]+)',
-        r'Sender:\s*([^\n]+)',
-    ]
-    
-    to_patterns = [
-        r'To:\s*([^\n]+)',
-        r'TO:\s*([^\n]+)',
-        r'Recipient:\s*([^\n]+)',
-    ]
-    
-    subject_patterns = [
-        r'Subject:\s*([^\n]+)',
-        r'SUBJECT:\s*([^\n]+)',
-        r'Re:\s*([^\n]+)',
-    ]
-    
-    cc_patterns = [
-        r'Cc:\s*([^\n]+)',
-        r'CC:\s*([^\n]+)',
-    ]
-    
-    # Extract From
-    for pattern in from_patterns:
-        match = re.search(pattern, text[:2000], re.IGNORECASE)
-        if match:
-            metadata['from'] = match.group(1).strip()
-            break
-    
-    # Extract To
-    for pattern in to_patterns:
-        match = re.search(pattern, text[:2000], re.IGNORECASE)
-        if match:
-            metadata['to'] = match.group(1).strip()
-            break
+    """Extract email metadata from the header lines at the top of document text."""
+    found = {}
+    # Walk the header lines in place rather than copying the scanned prefix to split it
+    limit = min(len(text), HEADER_SCAN_CHARS)
+    pos = 0
+    while pos < limit:
+        end = text.find('\n', pos, limit)
+        if end == -1:
+            end = limit
+        line = text[pos:end]
+        pos = end + 1
+        # "Label: value", with optional spaces/tabs around the label
+        label, colon, value = line.partition(':')
+        if not colon:
+            continue
+        label = label.strip(' \t').lower()
+        if label in _HEADER_LABELS and label not in found:
+            value = value.strip()
+            if value:
+                found[label] = value
+                if _PRIMARY_LABELS <= found.keys():
+                    break
     
-    # Extract Subject
-    for pattern in subject_patterns:
-        match = re.search(pattern, text[:2000], re.IGNORECASE)
-        if match:
-            metadata['subject'] = match.group(1).strip()
-            break
-    
-    # Extract Cc
-    for pattern in cc_patterns:
-        match = re.search(pattern, text[:2000], re.IGNORECASE)
-        if match:
-            metadata['cc'] = match.group(1).strip()
-            break
+    metadata = {}
+    for key, labels in HEADER_FIELDS.items():
+        for label in labels:
+            if label in found:
+                metadata[key] = found[label]
+                break
     
     return metadata
 
-def clean_field(value: str) -> str:
-    """Clean and normalize field value."""
-    if not value or value in ["", "N/A"]:
-        return "[Not visible in document]"
-    
-    # Remove common OCR artifacts
-    value = re.sub(r'\s+', ' ', value).strip()
-    
-    # Fix garbled patterns
-    if value in ["From:", "To:", "Cc:", "Sent:", "Subject:"]:
-        return "[Not visible in document]"
-    
-    # If very short and looks garbled
-    if len(value) < 3:
-        return "[Not visible in document]"
-    
-    # Limit length
-    if len(value) > 150:
-        value = value[:147] + "..."
-    
-    return value
-
 def main():
-    catalog_path = Path("data/meta/catalog.json")
-    with open(catalog_path) as f:
-        catalog = json.load(f)
+    catalog = load_catalog()
     
-    emails = [doc for doc in catalog if doc.get("document_category") in ["email", "correspondence"]]
+    emails = [doc for doc in catalog if doc.get("document_category") in EMAIL_CATEGORIES]
     
     print(f"Fixing metadata for {len(emails)} emails...")
     
     fixed_count = 0
     reextracted_count = 0
+    changed = False
     
     for doc in emails:
         doc_id = doc["id"]
         text_path = Path(f"data/derived/text/{doc_id}.txt")
         
         needs_fix = False
-        
-        # Check if fields need fixing
-        from_field = doc.get("email_from", "")
-        to_field = doc.get("email_to", "")
-        subject_field = doc.get("email_subject", "")
-        cc_field = doc.get("email_cc", "")
+        before = [doc.get(field) for field in EMAIL_FIELDS]
         
         # Try re-extraction if text exists and fields are empty
-        if text_path.exists() and (not from_field or not to_field or not subject_field):
-            text = text_path.read_text(errors="ignore")
+        extracted = {}
+        if (not doc.get("email_from") or not doc.get("email_to") or not doc.get("email_subject")) and text_path.exists():
+            # Only the header block is parsed; 4 bytes per char covers any UTF-8 sequence.
+            # Newlines are normalized as read_text() would.
+            with text_path.open("rb") as f:
+                text = f.read(HEADER_SCAN_CHARS * 4).decode("utf-8", errors="ignore")
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
             extracted = extract_email_metadata_from_text(text)
-            
             if extracted:
                 reextracted_count += 1
-                if extracted.get('from'):
-                    doc["email_from"] = clean_field(extracted['from'])
-                    needs_fix = True
-                if extracted.get('to'):
-                    doc["email_to"] = clean_field(extracted['to'])
-                    needs_fix = True
-                if extracted.get('subject'):
-                    doc["email_subject"] = clean_field(extracted['subject'])
-                    needs_fix = True
-                if extracted.get('cc'):
-                    doc["email_cc"] = clean_field(extracted['cc'])
-                    needs_fix = True
         
-        # Clean existing fields
-        doc["email_from"] = clean_field(doc.get("email_from", ""))
-        doc["email_to"] = clean_field(doc.get("email_to", ""))
-        doc["email_subject"] = clean_field(doc.get("email_subject", ""))
-        doc["email_cc"] = clean_field(doc.get("email_cc", ""))
+        # Clean each field once: the re-extracted value if there is one,
+        # otherwise whatever the catalog already holds
+        for field, key in EMAIL_FIELDS.items():
+            if extracted.get(key):
+                doc[field] = clean_field(extracted[key])
+                needs_fix = True
+            else:
+                value = doc.get(field, "")
+                if not is_clean_field(value):
+                    doc[field] = clean_field(value)
+        changed = changed or before != [doc[field] for field in EMAIL_FIELDS]
         
         if needs_fix:
             fixed_count += 1
     
-    # Write updated catalog
-    with open(catalog_path, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    # Write updated catalog (skipped when nothing changed)
+    if changed:
+        save_catalog(catalog)
     
     print(f"✓ Fixed {fixed_count} emails")
     print(f"✓ Re-extracted metadata for {reextracted_count} emails")
     
     # Stats
-    empty_from = sum(1 for doc in emails if doc.get("email_from") == "[Not visible in document]")
-    empty_to = sum(1 for doc in emails if doc.get("email_to") == "[Not visible in document]")
-    empty_subject = sum(1 for doc in emails if doc.get("email_subject") == "[Not visible in document]")
+    empty_from = sum(1 for doc in emails if doc.get("email_from") == NOT_VISIBLE)
+    empty_to = sum(1 for doc in emails if doc.get("email_to") == NOT_VISIBLE)
+    empty_subject = sum(1 for doc in emails if doc.get("email_subject") == NOT_VISIBLE)
     
     print(f"\nAfter fix:")
     print(f"  From '[Not visible]': {empty_from} ({empty_from/len(emails)*100:.1f}%)")
@@ -7,10 +7,20 @@ that avoid false positives while discovering all actual people mentioned.
 """
 from __future__ import annotations
 
+import os
 import re
-from pathlib import Path
-from typing import List, Set
-import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Set, Tuple
+
+from scripts.common import DERIVED_TEXT_DIR, load_catalog, save_catalog
+
+# Optional: google-re2 for linear-time scans of the simpler name patterns
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
 
 
 # Blacklist: Common false positives to exclude
@@ -61,12 +71,89 @@ BLACKLIST_TERMS = {
 }
 
 
+# Name patterns, compiled once at import. Titles are grouped by leading letter so
+# the engine can reject most positions on the first character.
+TITLE_NAME_PATTERN = (
+    r'\b(?:M(?:r|s|rs|iss)|Dr|Prof|President|Judge|Attorney|Agent|Detective|Officer'
+    r'|Senator|Representative|Governor)\.\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\b'
+)
+SUFFIX_NAME_PATTERN = (
+    r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\s+(?:Jr|Sr|II|III|IV|V|MD|PhD|Esq)\.?\b'
+)
+CONTEXT_VERBS = (
+    'said', 'testified', 'wrote', 'claimed', 'stated',
+    'reported', 'alleged', 'confirmed', 'denied', 'admitted',
+)
+CONTEXT_NAME_PATTERN = (
+    r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\s+(?:' + '|'.join(CONTEXT_VERBS) + r')\b'
+)
+TITLE_NAME_RE = re.compile(TITLE_NAME_PATTERN)
+SUFFIX_NAME_RE = re.compile(SUFFIX_NAME_PATTERN)
+CONTEXT_NAME_RE = re.compile(CONTEXT_NAME_PATTERN)
+
+# RE2 builds of patterns 1-3 (it has no lookarounds, so pattern 4 stays on re).
+# RE2's \b and \s are ASCII-only, so they are only used on ASCII text, with \s
+# spelled out as the characters Python's \s matches in that range.
+_ASCII_SPACE = r'[\t\n\x0b\x0c\r\x1c-\x1f ]'
+if HAS_RE2:
+    _RE2_NAME_PATTERNS = tuple(
+        re2.compile(pattern.replace(r'\s', _ASCII_SPACE))
+        for pattern in (TITLE_NAME_PATTERN, SUFFIX_NAME_PATTERN, CONTEXT_NAME_PATTERN)
+    )
+FULL_NAME_RE = re.compile(
+    r'(?<=[a-z,;:\)]\s)([A-Z][a-z]{2,12}\s+(?:[A-Z][a-z]{1,12}\s+)?[A-Z][a-z]{2,15})(?=\s+[a-z,;:\(\[])'
+)
+
+# Known high-profile names in the Epstein case, always reported with this spelling
+HIGH_PROFILE_NAMES = [
+    'Jeffrey Epstein', 'Ghislaine Maxwell', 'Virginia Giuffre', 'Virginia Roberts',
+    'Prince Andrew', 'Bill Clinton', 'Donald Trump', 'Alan Dershowitz',
+    'Les Wexner', 'Jean-Luc Brunel', 'Sarah Kellen', 'Nadia Marcinkova',
+    'Haley Robson', 'Adriana Ross', 'Lesley Groff', 'Juan Alessi',
+    'Alfredo Rodriguez', 'Tony Figueroa', 'Rinaldo Rizzo', 'Emmy Tayler',
+    'Eva Andersson-Dubin', 'Glenn Dubin', 'Marvin Minsky', 'Stephen Hawking',
+    'Kevin Spacey', 'Chris Tucker', 'Naomi Campbell', 'Heidi Klum',
+    'Courtney Love', 'George Mitchell', 'Ron Burkle', 'Bill Richardson',
+    'Ehud Barak', 'George J. Mitchell', 'Jean Luc Brunel', 'Brunel',
+    'Andrew Albert Christian Edward', 'Duke of York',
+]
+# Lowercased name -> every canonical name it contains (e.g. 'jean-luc brunel'
+# also implies 'Brunel'), so one match per start position is enough.
+_HIGH_PROFILE_IMPLIED = {
+    name.lower(): [other for other in HIGH_PROFILE_NAMES if other.lower() in name.lower()]
+    for name in HIGH_PROFILE_NAMES
+}
+# Single pass over the lowercased text. The lookahead reports a match at every
+# start position, so partially overlapping names ('Prince Andrew' and 'Andrew
+# Albert Christian Edward') are both found.
+HIGH_PROFILE_RE = re.compile(
+    '(?=(' + '|'.join(
+        re.escape(name) for name in sorted(_HIGH_PROFILE_IMPLIED, key=len, reverse=True)
+    ) + '))'
+)
+
+# Characters that never appear in a clean name: digits, OCR artifacts, newlines
+_BAD_NAME_CHARS = frozenset("0123456789_-.@\n")
+
+
 def is_likely_person_name(candidate: str) -> bool:
     """
     Determine if a candidate string is likely a real person name.
     
     Returns False for common false positives.
     """
+    # Reject if contains common OCR artifacts or newlines
+    if not _BAD_NAME_CHARS.isdisjoint(candidate):
+        return False
+    
+    # Reject if has excessive whitespace
+    if candidate.find('  ') != -1:
+        return False
+    
+    # Reject if all caps (likely acronym or header)
+    if candidate.isupper() and len(candidate) > 5:
+        return False
+    
     # Normalize
     lower = candidate.lower().strip()
     
@@ -79,18 +166,6 @@ def is_likely_person_name(candidate: str) -> bool:
     if any(part in BLACKLIST_TERMS for part in parts):
         return False
     
-    # Reject if contains common OCR artifacts
-    if re.search(r'[\d_\-\.@]', candidate):
-        return False
-    
-    # Reject if has excessive whitespace/newlines
-    if '\n' in candidate or '  ' in candidate:
-        return False
-    
-    # Reject if all caps (likely acronym or header)
-    if candidate.isupper() and len(candidate) > 5:
-        return False
-    
     # Reject if starts with lowercase (malformed)
     if parts[0][0].islower():
         return False
@@ -118,36 +193,40 @@ def extract_person_names_improved(text: str) -> List[str]:
     """
     names = set()
     
+    if HAS_RE2 and text.isascii():
+        title_re, suffix_re, context_re = _RE2_NAME_PATTERNS
+    else:
+        title_re, suffix_re, context_re = TITLE_NAME_RE, SUFFIX_NAME_RE, CONTEXT_NAME_RE
+    
     # Pattern 1: Title + Capitalized Name (2-3 words)
     # Mr. Jeffrey Epstein, Dr. Jane Smith, President Bill Clinton
-    title_pattern = r'\b(?:Mr|Ms|Mrs|Miss|Dr|Prof|President|Judge|Attorney|Agent|Detective|Officer|Senator|Representative|Governor)\.\s+([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
-    for match in re.finditer(title_pattern, text):
+    for match in title_re.finditer(text):
         candidate = match.group(1).strip()
         if is_likely_person_name(candidate):
             names.add(candidate)
     
     # Pattern 2: Name + Suffix
     # John Doe Jr., Jane Smith MD, Robert Brown III
-    suffix_pattern = r'\b([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:Jr|Sr|II|III|IV|V|MD|PhD|Esq)\.?\b'
-    for match in re.finditer(suffix_pattern, text):
+    for match in suffix_re.finditer(text):
         candidate = match.group(1).strip()
         if is_likely_person_name(candidate):
             names.add(candidate)
     
     # Pattern 3: Capitalized sequences in sentence context
     # Look for "... [Name] said/testified/wrote/claimed ..."
-    context_pattern = r'\b([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:said|testified|wrote|claimed|stated|reported|alleged|confirmed|denied|admitted)\b'
-    for match in re.finditer(context_pattern, text):
-        candidate = match.group(1).strip()
-        if is_likely_person_name(candidate):
-            names.add(candidate)
+    # A substring check per verb is far cheaper than a regex pass over text
+    # that contains none of them.
+    if any(verb in text for verb in CONTEXT_VERBS):
+        for match in context_re.finditer(text):
+            candidate = match.group(1).strip()
+            if is_likely_person_name(candidate):
+                names.add(candidate)
     
     # Pattern 4: High-confidence full names (First Middle? Last)
     # Must appear in middle of sentence (not start/end of line)
     # Must not be preceded by blacklisted terms
     # John Michael Doe, Jane Elizabeth Smith
-    full_name_pattern = r'(?<=[a-z,;:\)]\s)([A-Z][a-z]{2,12}\s+(?:[A-Z][a-z]{1,12}\s+)?[A-Z][a-z]{2,15})(?=\s+[a-z,;:\(\[])'
-    for match in re.finditer(full_name_pattern, text):
+    for match in FULL_NAME_RE.finditer(text):
         candidate = match.group(1).strip()
         if is_likely_person_name(candidate):
             # Extra validation: must have common name structure
@@ -157,79 +236,66 @@ def extract_person_names_improved(text: str) -> List[str]:
     
     # Pattern 5: Known high-profile names (case-insensitive search)
     # These are mentioned in Epstein case - add them if found
-    high_profile_names = [
-        'Jeffrey Epstein', 'Ghislaine Maxwell', 'Virginia Giuffre', 'Virginia Roberts',
-        'Prince Andrew', 'Bill Clinton', 'Donald Trump', 'Alan Dershowitz',
-        'Les Wexner', 'Jean-Luc Brunel', 'Sarah Kellen', 'Nadia Marcinkova',
-        'Haley Robson', 'Adriana Ross', 'Lesley Groff', 'Juan Alessi',
-        'Alfredo Rodriguez', 'Tony Figueroa', 'Rinaldo Rizzo', 'Emmy Tayler',
-        'Eva Andersson-Dubin', 'Glenn Dubin', 'Marvin Minsky', 'Stephen Hawking',
-        'Kevin Spacey', 'Chris Tucker', 'Naomi Campbell', 'Heidi Klum',
-        'Courtney Love', 'George Mitchell', 'Ron Burkle', 'Bill Richardson',
-        'Ehud Barak', 'George J. Mitchell', 'Jean Luc Brunel', 'Brunel',
-        'Andrew Albert Christian Edward', 'Duke of York',
-    ]
-    
-    text_lower = text.lower()
-    for name in high_profile_names:
-        # Search case-insensitive
-        if name.lower() in text_lower:
-            # Find the actual occurrence to preserve capitalization
-            pattern = re.compile(re.escape(name), re.IGNORECASE)
-            match = pattern.search(text)
-            if match:
-                names.add(name)  # Use canonical name
+    for match in HIGH_PROFILE_RE.finditer(text.lower()):
+        names.update(_HIGH_PROFILE_IMPLIED[match.group(1)])
     
     return sorted(names)
 
 
+def _text_doc_ids() -> Set[str]:
+    """Ids of documents with extracted text, from one directory listing."""
+    if not DERIVED_TEXT_DIR.is_dir():
+        return set()
+    with os.scandir(DERIVED_TEXT_DIR) as entries:
+        return {entry.name[:-4] for entry in entries if entry.name.endswith(".txt") and entry.is_file()}
+
+
+def _extract_for_doc(doc_id: str) -> Tuple[str, List[str]]:
+    """Extract person names for one document with extracted text."""
+    text = (DERIVED_TEXT_DIR / f"{doc_id}.txt").read_text(errors="ignore")
+    return doc_id, extract_person_names_improved(text)
+
+
 def main():
     """Re-extract person names from all documents."""
-    catalog_path = Path("data/meta/catalog.json")
-    
-    with open(catalog_path) as f:
-        catalog = json.load(f)
+    catalog = load_catalog()
     
     print(f"Re-extracting person names from {len(catalog)} documents...")
     
+    have_text = _text_doc_ids()
+    doc_ids = [doc["id"] for doc in catalog if doc["id"] in have_text]
+    workers = max(1, min(os.cpu_count() or 1, len(doc_ids)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = dict(executor.map(_extract_for_doc, doc_ids, chunksize=32))
+    else:
+        results = dict(map(_extract_for_doc, doc_ids))
+    
     updated_count = 0
+    changed = False
     for doc in catalog:
-        doc_id = doc["id"]
-        text_path = Path(f"data/derived/text/{doc_id}.txt")
-        
-        if not text_path.exists():
-            continue
-        
-        text = text_path.read_text(errors="ignore")
-        
-        # Extract improved person names
-        person_names = extract_person_names_improved(text)
+        person_names = results.get(doc["id"])
         
         # Only update if we found names
         if person_names:
+            changed = changed or doc.get("person_names") != person_names
             doc["person_names"] = person_names
             updated_count += 1
     
-    # Write updated catalog
-    with open(catalog_path, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    # Write updated catalog (skipped when nothing changed)
+    if changed:
+        save_catalog(catalog)
     
     print(f"✓ Updated {updated_count} documents with improved person extraction")
     
     # Stats
-    all_names = set()
+    name_counts = Counter()
     for doc in catalog:
-        if "person_names" in doc and doc["person_names"]:
-            all_names.update(doc["person_names"])
+        name_counts.update(doc.get("person_names", ()))
     
-    print(f"\nTotal unique person names: {len(all_names)}")
+    print(f"\nTotal unique person names: {len(name_counts)}")
     print("\nTop 20 most mentioned:")
-    name_counts = {}
-    for doc in catalog:
-        for name in doc.get("person_names", []):
-            name_counts[name] = name_counts.get(name, 0) + 1
-    
-    for name, count in sorted(name_counts.items(), key=lambda x: x[1], reverse=True)[:20]:
+    for name, count in name_counts.most_common(20):
         print(f"  {name}: {count} docs")
 
 
@@ -7,14 +7,12 @@ temporarily removes the ocr_applied flag so extract.py will retry OCR.
 """
 from __future__ import annotations
 
-import json
-from pathlib import Path
+from scripts.common import load_catalog, save_catalog
 
 
 def main():
     """Remove ocr_applied flag from image PDFs without OCR."""
-    catalog_path = Path('data/meta/catalog.json')
-    catalog = json.load(catalog_path.open())
+    catalog = load_catalog()
     
     # Find image PDFs without successful OCR
     to_reocr = [
@@ -33,9 +31,9 @@ def main():
             # Keep existing text for comparison
             entry['ocr_text_old'] = entry.get('ocr_text', '')
     
-    # Save updated catalog
-    with catalog_path.open('w') as f:
-        json.dump(catalog, f, indent=2)
+    # Save updated catalog (skipped when nothing changed)
+    if to_reocr:
+        save_catalog(catalog)
     
     print(f'Removed ocr_applied flag from {len(to_reocr)} documents')
     print(f'Run: .venv/bin/python -m scripts.extract')
@@ -3,11 +3,31 @@
 Fuzzy categorization for OCR-garbled text.
 Uses edit distance to match keywords even with OCR errors.
 """
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from difflib import SequenceMatcher
 import re
 
+from scripts.common import load_catalog, load_json, save_catalog, sha256_file, write_json
+
+# Optional: rapidfuzz scores all word/keyword pairs in C++ (falls back to difflib)
+try:
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# process.cdist returns a numpy array; without numpy, score keyword by keyword
+try:
+    import numpy  # noqa: F401
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Keywords for each category (will match fuzzily)
 FUZZY_KEYWORDS = {
     'flight-log': [
@@ -44,6 +64,11 @@ FUZZY_KEYWORDS = {
     ],
 }
 
+# Lower threshold for OCR
+OCR_THRESHOLD = 0.70
+# Sidecar cache: text file sha256 -> [category, confidence]
+FUZZY_CACHE_PATH = Path("data/meta/fuzzy_cache.json")
+
 def fuzzy_match(word: str, target: str, threshold: float = 0.75) -> bool:
     """
     Check if word matches target with fuzzy matching.
@@ -52,56 +77,151 @@ def fuzzy_match(word: str, target: str, threshold: float = 0.75) -> bool:
     if len(word) < 3 or len(target) < 3:
         return word.lower() == target.lower()
     
-    similarity = SequenceMatcher(None, word.lower(), target.lower()).ratio()
-    return similarity >= threshold
+    return _fuzzy_match_lower(word.lower(), target.lower(), threshold)
 
-def find_fuzzy_keywords(text: str, keywords: list, threshold: float = 0.75) -> int:
+# Common words recur across documents; the difflib fallback scores each pair once per process
+@lru_cache(maxsize=262144)
+def _fuzzy_match_lower(word: str, target: str, threshold: float) -> bool:
+    """fuzzy_match for a word and target that are already lowercase."""
+    if len(word) < 3 or len(target) < 3:
+        return word == target
+    
+    # ratio() is 2 * matches / total length, and matches <= the shorter length,
+    # so a big length difference rules out a match without running the matcher
+    if 2.0 * min(len(word), len(target)) / (len(word) + len(target)) < threshold:
+        return False
+    
+    # quick_ratio() is a cheap upper bound on ratio(); most pairs fail it
+    matcher = SequenceMatcher(None, word, target)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+def _keyword_matches(words: list, keywords: list, threshold: float) -> list:
     """
-    Count fuzzy matches for keywords in text.
+    For each keyword, whether it fuzzily matches at least one text word.
+    
+    Same rule as fuzzy_match: words or keywords shorter than 3 characters
+    must match exactly.
     """
-    # Tokenize text (split on whitespace and punctuation)
-    words = re.findall(r'\b\w+\b', text.lower())
+    if not HAS_RAPIDFUZZ:
+        # Words and keywords are lowercased by the callers
+        return [any(_fuzzy_match_lower(word, keyword, threshold) for word in words) for keyword in keywords]
     
-    match_count = 0
-    for keyword in keywords:
-        keyword_words = keyword.split()
-        
-        if len(keyword_words) == 1:
-            # Single word keyword - check each text word
-            for word in words:
-                if fuzzy_match(word, keyword, threshold):
-                    match_count += 1
-                    break  # Count each keyword once
-        else:
-            # Multi-word keyword - look for phrase
-            keyword_lower = keyword.lower()
-            if keyword_lower in text.lower():
-                match_count += 1
+    matched = [len(keyword) < 3 and keyword in words for keyword in keywords]
+    long_positions = [i for i, keyword in enumerate(keywords) if len(keyword) >= 3]
+    long_keywords = [keywords[i] for i in long_positions]
+    long_words = [word for word in words if len(word) >= 3]
+    if not long_keywords or not long_words:
+        return matched
+    
+    cutoff = threshold * 100
+    if HAS_NUMPY:
+        # One matrix call is ~4x faster than a search per keyword
+        scores = process.cdist(long_keywords, long_words, scorer=fuzz.ratio, score_cutoff=cutoff)
+        hits = (scores.max(axis=1) >= cutoff).tolist()
+    else:
+        # extractOne returns None when no word reaches the cutoff
+        hits = [
+            process.extractOne(keyword, long_words, scorer=fuzz.ratio, score_cutoff=cutoff) is not None
+            for keyword in long_keywords
+        ]
+    for i, hit in zip(long_positions, hits):
+        matched[i] = hit
+    return matched
+
+def _split_keywords(keywords: list) -> tuple[list, list]:
+    """Split keywords into lowercased single words and multi-word phrases."""
+    single_keywords = [keyword.lower() for keyword in keywords if len(keyword.split()) == 1]
+    phrases = [keyword.lower() for keyword in keywords if len(keyword.split()) != 1]
+    return single_keywords, phrases
+
+# Per category (single_keywords, phrases), split once at import
+CATEGORY_KEYWORDS = {category: _split_keywords(keywords) for category, keywords in FUZZY_KEYWORDS.items()}
+# Fixed category order; fuzzy_categorize keeps scores in a list indexed by position
+CATEGORIES = tuple(CATEGORY_KEYWORDS)
+
+# Distinct single-word keywords of all categories, scored together once per document,
+# and per category the positions of its keywords in that list
+ALL_SINGLE_KEYWORDS = list(dict.fromkeys(
+    keyword for single_keywords, _ in CATEGORY_KEYWORDS.values() for keyword in single_keywords
+))
+_KEYWORD_POSITION = {keyword: i for i, keyword in enumerate(ALL_SINGLE_KEYWORDS)}
+CATEGORY_KEYWORD_POSITIONS = [
+    [_KEYWORD_POSITION[keyword] for keyword in single_keywords]
+    for single_keywords, _ in CATEGORY_KEYWORDS.values()
+]
+
+# Word tokens (same as \b\w+\b). fuzzy_categorize drops tokens that cannot match any
+# keyword: under 3 chars a match must be exact, so shorter than every keyword is a miss.
+_WORD_RE = re.compile(r'\w+')
+_TOKEN_RE = re.compile(r'\w{%d,}' % min(3, min(len(k) for ks in FUZZY_KEYWORDS.values() for k in ks)))
+
+# Each distinct phrase -> indexes into CATEGORIES of the categories listing it,
+# so one pass over the phrases serves every category
+PHRASE_CATEGORIES = {}
+for _index, (_, _phrases) in enumerate(CATEGORY_KEYWORDS.values()):
+    for _phrase in _phrases:
+        PHRASE_CATEGORIES.setdefault(_phrase, []).append(_index)
+
+def count_keyword_matches(words: list, text_lower: str, single_keywords: list,
+                          phrases: list, threshold: float = 0.75) -> int:
+    """
+    Count fuzzy matches for pre-split keywords in already tokenized text.
+    
+    Args:
+        words: Tokens of text_lower (so already lowercase)
+        text_lower: Lowercased text, for phrase lookups
+        single_keywords: Lowercased single-word keywords (matched fuzzily)
+        phrases: Lowercased multi-word keywords (matched as substrings)
+        threshold: Minimum similarity for a fuzzy match
+    """
+    # Single word keywords - each counts once if some text word matches
+    match_count = sum(_keyword_matches(words, single_keywords, threshold))
+    
+    # Multi-word keyword - look for phrase
+    match_count += sum(1 for phrase in phrases if phrase in text_lower)
     
     return match_count
 
+def find_fuzzy_keywords(text: str, keywords: list, threshold: float = 0.75) -> int:
+    """
+    Count fuzzy matches for keywords in text.
+    """
+    # Tokenize text (split on whitespace and punctuation)
+    text_lower = text.lower()
+    words = list(dict.fromkeys(_WORD_RE.findall(text_lower)))
+    single_keywords, phrases = _split_keywords(keywords)
+    return count_keyword_matches(words, text_lower, single_keywords, phrases, threshold)
+
 def fuzzy_categorize(text: str, threshold: float = 0.75) -> tuple[str, float]:
     """
     Categorize text using fuzzy keyword matching.
     Returns (category, confidence_score)
     """
-    # Only use first 3000 chars for speed
-    text_sample = text[:3000]
+    # Only use first 3000 chars for speed; lowercase and tokenize once for all categories
+    text_sample = text[:3000].lower()
+    # Only whether some word matches matters, so each distinct word is scored once
+    words = list(dict.fromkeys(_TOKEN_RE.findall(text_sample)))
     
-    scores = {}
-    for category, keywords in FUZZY_KEYWORDS.items():
-        score = find_fuzzy_keywords(text_sample, keywords, threshold)
-        scores[category] = score
+    # Score every category's keywords in one batch, then count per category
+    matched = _keyword_matches(words, ALL_SINGLE_KEYWORDS, threshold)
+    scores = [sum(matched[i] for i in positions) for positions in CATEGORY_KEYWORD_POSITIONS]
     
-    # Get best category
-    if not scores or max(scores.values()) == 0:
+    # Phrases are plain substring checks; each one is looked for once
+    for phrase, indexes in PHRASE_CATEGORIES.items():
+        if phrase in text_sample:
+            for index in indexes:
+                scores[index] += 1
+    
+    # Get best category (first one on ties)
+    best_index = max(range(len(scores)), key=scores.__getitem__, default=None)
+    if best_index is None or scores[best_index] == 0:
         return None, 0.0
     
-    best_category = max(scores, key=scores.get)
-    best_score = scores[best_category]
+    best_category = CATEGORIES[best_index]
+    best_score = scores[best_index]
     
     # Calculate confidence
-    total_matches = sum(scores.values())
+    total_matches = sum(scores)
     confidence = best_score / total_matches if total_matches > 0 else 0.0
     
     # Minimum threshold (need at least 2 keyword matches)
@@ -110,10 +230,40 @@ def fuzzy_categorize(text: str, threshold: float = 0.75) -> tuple[str, float]:
     
     return best_category, confidence
 
+def categorize_one(doc_id: str) -> tuple[str, str, float]:
+    """
+    Fuzzy categorize one document from its extracted text.
+    Returns (doc_id, category, confidence); category is None if there is no text.
+    """
+    text_path = Path(f"data/derived/text/{doc_id}.txt")
+    if not text_path.exists():
+        return doc_id, None, 0.0
+    
+    text = text_path.read_text(errors="ignore")
+    category, confidence = fuzzy_categorize(text, threshold=OCR_THRESHOLD)
+    return doc_id, category, confidence
+
+def _cache_key() -> str:
+    """Fingerprint of the keywords and threshold; cached results are only valid for these."""
+    settings = json.dumps([FUZZY_KEYWORDS, OCR_THRESHOLD], sort_keys=True)
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+def load_fuzzy_cache() -> tuple[dict, dict]:
+    """
+    Load the sidecar cache, dropping it if the keywords or threshold changed.
+    Returns (results, texts): text sha256 -> [category, confidence], and
+    doc id -> [size, mtime_ns, sha256] of the text file when it was last hashed.
+    """
+    cache = load_json(FUZZY_CACHE_PATH, {})
+    if cache.get("key") != _cache_key():
+        return {}, {}
+    return cache.get("results", {}), cache.get("texts", {})
+
+def save_fuzzy_cache(results: dict, texts: dict) -> None:
+    write_json(FUZZY_CACHE_PATH, {"key": _cache_key(), "results": results, "texts": texts})
+
 def main():
-    catalog_path = Path("data/meta/catalog.json")
-    with open(catalog_path) as f:
-        catalog = json.load(f)
+    catalog = load_catalog()
     
     # Get uncategorized docs with OCR applied
     uncategorized_ocr = [
@@ -125,19 +275,53 @@ def main():
     
     print(f"Fuzzy categorizing {len(uncategorized_ocr)} OCR'd uncategorized documents...")
     
+    # Hash each text; unchanged texts reuse the result from an earlier run.
+    # A text file whose size and mtime match the last run keeps its hash without being read.
+    cache, known_texts = load_fuzzy_cache()
+    texts = {}
+    text_shas = {}
+    for doc in uncategorized_ocr:
+        text_path = Path(f"data/derived/text/{doc['id']}.txt")
+        try:
+            stat = text_path.stat()
+        except FileNotFoundError:
+            continue
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        known = known_texts.get(doc["id"])
+        sha = known[2] if known and known[:2] == fingerprint else sha256_file(text_path)
+        texts[doc["id"]] = fingerprint + [sha]
+        text_shas[doc["id"]] = sha
+    
+    # One document per distinct uncached text
+    pending = {}
+    for doc_id, sha in text_shas.items():
+        if sha not in cache:
+            pending.setdefault(sha, doc_id)
+    doc_ids = list(pending.values())
+    print(f"  Reusing cached results for {len(text_shas) - len(doc_ids)}, scoring {len(doc_ids)}")
+    
+    # Documents are independent, so score them across all cores
+    workers = max(1, min(os.cpu_count() or 1, len(doc_ids)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(categorize_one, doc_ids, chunksize=16))
+    else:
+        results = list(map(categorize_one, doc_ids))
+    
+    for doc_id, category, confidence in results:
+        cache[text_shas[doc_id]] = [category, confidence]
+    if results or texts != known_texts:
+        save_fuzzy_cache(cache, texts)
+    
     categorized_count = 0
     category_stats = {}
     
     for i, doc in enumerate(uncategorized_ocr):
-        doc_id = doc["id"]
-        text_path = Path(f"data/derived/text/{doc_id}.txt")
-        
-        if not text_path.exists():
+        sha = text_shas.get(doc["id"])
+        if sha is None:
             continue
         
-        text = text_path.read_text(errors="ignore")
-        category, confidence = fuzzy_categorize(text, threshold=0.70)  # Lower threshold for OCR
-        
+        category, confidence = cache[sha]
         if category:
             doc["document_category"] = category
             doc["category_confidence"] = round(confidence, 2)
@@ -148,9 +332,9 @@ def main():
             if (i + 1) % 10 == 0:
                 print(f"  Processed {i+1}/{len(uncategorized_ocr)}...")
     
-    # Write updated catalog
-    with open(catalog_path, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    # Write updated catalog (skipped when nothing changed)
+    if categorized_count:
+        save_catalog(catalog)
     
     print(f"\n✓ Fuzzy categorized {categorized_count} documents")
     
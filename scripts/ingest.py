@@ -1,30 +1,37 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import random
 import re
 import shutil
 import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from http.cookiejar import CookieJar
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
 from pypdf import PdfReader
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 
 from scripts.common import (
     RAW_DIR,
     detect_mime,
     ensure_sources,
+    index_by_sha,
     load_catalog,
+    load_json,
     save_catalog,
     sha256_file,
     slugify,
@@ -32,13 +39,42 @@ from scripts.common import (
     write_json,
 )
 from scripts.cookies import ensure_doj_age_verified_cookie, load_cookie_jar_from_path
-from scripts.doj_hub import collect_links, discover_doj_hub_targets
+from scripts.doj_hub import collect_links_stream, discover_doj_hub_targets
+
+# Optional: pikepdf (qpdf) counts pages in C++ instead of pypdf's Python page-tree walk
+try:
+    import pikepdf
+    HAS_PIKEPDF = True
+except ImportError:
+    HAS_PIKEPDF = False
 
 CONFIG_PATH = Path("config/sources.json")
 STATE_PATH = Path("data/meta/ingest_state.json")
-
-
-@dataclass
+# Local to the machine running ingest; kept out of data/meta, which CI commits
+HEAD_CACHE_PATH = Path(".cache/ingest/head_cache.json")
+# HEAD results younger than this are reused without asking the server again
+HEAD_CACHE_TTL_SECONDS = 24 * 3600
+# Older entries are dropped on load, even when they carry validators to revalidate with
+HEAD_CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+# HEAD answers that mean "ask with GET instead"
+HEAD_REJECTED_STATUSES = {403, 405, 501}
+# Block size for copying download bodies to disk
+DOWNLOAD_BUFFER_SIZE = 4 * 1024 * 1024
+# Leading bytes of a download checked for an HTML page in place of the file
+SNIFF_BYTES = 200
+# Unread bodies up to this size are drained rather than dropping the connection
+RELEASE_DRAIN_MAX_BYTES = 64 * 1024
+# Upper bound for a single retry backoff (a longer Retry-After still wins)
+BACKOFF_CAP_SECONDS = 60.0
+
+_YEAR_RE = re.compile(r"(19|20)\d{2}")
+_DISPOSITION_FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+_PAGE_NOT_FOUND_RE = re.compile("page not found", re.IGNORECASE)
+# HTML bodies larger than this are not scanned for a not-found message
+NOT_FOUND_SCAN_MAX_BYTES = 2_000_000
+
+
+@dataclass(slots=True)
 class SourceConfig:
     id: str
     name: str
@@ -53,7 +89,7 @@ class SourceConfig:
     referer: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredFile:
     url: str
     title: str
@@ -63,7 +99,7 @@ class DiscoveredFile:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResult:
     size: int
     content_type: str
@@ -71,20 +107,38 @@ class DownloadResult:
     final_url: str
     etag: str
     last_modified: str
+    sha256: str = ""
+    not_modified: bool = False
+    # First SNIFF_BYTES of the body, kept for content sniffing without reopening the file
+    head: bytes = b""
 
 
-@dataclass
+@dataclass(slots=True)
 class SkipReason:
     reason: str
     detail: str
 
 
+@dataclass(slots=True)
+class FetchOutcome:
+    not_modified: bool = False
+    est_size: Optional[int] = None
+    failed_status: int = 0
+    result: Optional[DownloadResult] = None
+    blocked: Optional[SkipReason] = None
+    path: Optional[Path] = None
+    sha: str = ""
+    pages: Optional[int] = None
+
+
 @dataclass
 class RequestContext:
     timeout: int
     retry_max: int
     backoff_base: float
     limiter: RateLimiter
+    # url -> fields of its last HEAD response; see cached_head()
+    head_cache: Optional[Dict[str, Dict[str, Any]]] = None
 
 
 def load_config() -> Dict[str, Any]:
@@ -99,16 +153,54 @@ class RateLimiter:
     def __init__(self, requests_per_second: float) -> None:
         self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
         self._last = 0.0
+        # Shared by download threads; the lock keeps the overall rate, not a per-thread one
+        self._lock = threading.Lock()
 
-    def wait(self) -> None:
-        if self.interval <= 0:
+    def wait(self, url: str = "") -> None:
+        if self.interval <= 0 and self._last <= time.monotonic():
             return
-        now = time.monotonic()
-        elapsed = now - self._last
-        sleep_for = self.interval - elapsed
-        if sleep_for > 0:
-            time.sleep(sleep_for)
-        self._last = time.monotonic()
+        # Reserve the next slot under the lock and sleep outside it, so waiting
+        # threads queue up one interval apart without holding the lock
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last + self.interval)
+            self._last = slot
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Hold back every later wait() for at least seconds, e.g. after a 429."""
+        with self._lock:
+            self._last = max(self._last, time.monotonic() + seconds - self.interval)
+
+
+class HostRateLimiter(RateLimiter):
+    """Applies the rate separately per host, so requests to one host never wait on another's.
+
+    Args:
+        requests_per_second: Rate for hosts without an override.
+        per_host: host -> requests_per_second overrides.
+    """
+
+    def __init__(self, requests_per_second: float, per_host: Optional[Dict[str, float]] = None) -> None:
+        super().__init__(requests_per_second)
+        self.requests_per_second = requests_per_second
+        self.per_host = dict(per_host or {})
+        self._hosts: Dict[str, RateLimiter] = {}
+
+    def for_host(self, host: str) -> RateLimiter:
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                rate = self.per_host.get(host, self.requests_per_second)
+                limiter = self._hosts[host] = RateLimiter(rate)
+        return limiter
+
+    def wait(self, url: str = "") -> None:
+        self.for_host(urlparse(url).netloc).wait()
+
+    def pause(self, url: str, seconds: float) -> None:
+        self.for_host(urlparse(url).netloc).pause(url, seconds)
 
 
 def parse_retry_after(value: str) -> Optional[float]:
@@ -118,10 +210,28 @@ def parse_retry_after(value: str) -> Optional[float]:
         return None
 
 
-def compute_backoff(base: float, attempt: int, retry_after: Optional[float]) -> float:
-    backoff = base * (2 ** attempt)
-    jitter = random.uniform(0, base)
-    wait = backoff + jitter
+def release_response(resp: requests.Response) -> None:
+    """Close resp, reading a small unread body first.
+
+    A fully read response returns its keep-alive connection to the pool;
+    closing one mid-body drops the connection instead.
+    """
+    length = resp.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) <= RELEASE_DRAIN_MAX_BYTES:
+        try:
+            resp.content
+        except requests.RequestException:
+            pass
+    resp.close()
+
+
+def compute_backoff(base: float, prev_wait: float, retry_after: Optional[float]) -> float:
+    """Decorrelated jitter: each wait is drawn from [base, 3 * prev_wait], up to BACKOFF_CAP_SECONDS.
+
+    Workers retrying together draw from diverging ranges, so their retries spread
+    out instead of landing in step. A Retry-After from the server is always honoured.
+    """
+    wait = min(BACKOFF_CAP_SECONDS, random.uniform(base, max(base, prev_wait * 3)))
     if retry_after is not None:
         wait = max(wait, retry_after)
     return wait
@@ -140,8 +250,9 @@ def request_with_retry(
     stream: bool = False,
 ) -> requests.Response:
     retryable = {429, 500, 502, 503, 504}
+    wait = backoff_base
     for attempt in range(retry_max + 1):
-        limiter.wait()
+        limiter.wait(url)
         try:
             resp = session.request(
                 method,
@@ -154,18 +265,21 @@ def request_with_retry(
         except requests.RequestException as exc:
             if attempt >= retry_max:
                 raise exc
-            wait = compute_backoff(backoff_base, attempt, None)
+            wait = compute_backoff(backoff_base, wait, None)
             print(f"[ingest] retry exception={exc} url={url} wait={wait:.2f}s")
             time.sleep(wait)
             continue
 
         if resp.status_code in retryable and attempt < retry_max:
             retry_after = parse_retry_after(resp.headers.get("Retry-After", ""))
-            wait = compute_backoff(backoff_base, attempt, retry_after)
+            wait = compute_backoff(backoff_base, wait, retry_after)
             print(
                 f"[ingest] retry status={resp.status_code} url={url} wait={wait:.2f}s"
             )
-            resp.close()
+            if resp.status_code == 429:
+                # Other threads hold off the host too, rather than each collecting its own 429
+                limiter.pause(url, wait)
+            release_response(resp)
             time.sleep(wait)
             continue
 
@@ -173,15 +287,36 @@ def request_with_retry(
     raise RuntimeError("request_with_retry failed unexpectedly")
 
 
-def build_session(config: Dict[str, Any]) -> requests.Session:
+def select_concurrency(config: Dict[str, Any]) -> int:
     defaults = config.get("defaults", {})
     max_concurrency_env = os.getenv("EPPIE_MAX_CONCURRENCY")
     max_concurrency = int(max_concurrency_env) if max_concurrency_env else int(defaults.get("max_concurrency", 2))
+    return max(1, max_concurrency)
+
+
+def select_pool_sizes(config: Dict[str, Any]) -> Dict[str, int]:
+    connections_env = os.getenv("EPPIE_POOL_CONNECTIONS")
+    maxsize_env = os.getenv("EPPIE_POOL_MAXSIZE")
+    # connections is how many per-host pools are kept; keep one for every configured host
+    hosts = {urlparse(source.get("base_url", "")).netloc for source in config.get("sources", [])}
+    # maxsize is connections kept per host; HEAD batches and retries overlap the downloads,
+    # and a full pool discards connections instead of reusing them
+    return {
+        "connections": int(connections_env) if connections_env else max(DEFAULT_POOLSIZE, len(hosts)),
+        "maxsize": int(maxsize_env) if maxsize_env else max(DEFAULT_POOLSIZE, select_concurrency(config) * 2),
+    }
+
+
+def build_session(config: Dict[str, Any]) -> requests.Session:
+    defaults = config.get("defaults", {})
+    pool_sizes = select_pool_sizes(config)
     retry = Retry(total=0, raise_on_status=False)
     adapter = HTTPAdapter(
         max_retries=retry,
-        pool_connections=max_concurrency,
-        pool_maxsize=max_concurrency,
+        pool_connections=pool_sizes["connections"],
+        pool_maxsize=pool_sizes["maxsize"],
+        # Past maxsize, open an extra connection rather than wait for one
+        pool_block=False,
     )
     session = requests.Session()
     session.headers.update(
@@ -309,32 +444,116 @@ def allowed_extension(url: str, allowed: Iterable[str], ignored: Iterable[str])
     return ext in allowed
 
 
-def estimate_size(
-    session: requests.Session,
+def load_head_cache() -> Dict[str, Dict[str, Any]]:
+    cache = load_json(HEAD_CACHE_PATH, {})
+    now = time.time()
+    # Expired entries are still worth keeping for a while if they carry validators to revalidate with
+    return {
+        url: entry
+        for url, entry in cache.items()
+        if head_cache_fresh(entry)
+        or (
+            (entry.get("etag") or entry.get("last_modified"))
+            and now - entry.get("fetched_at", 0) < HEAD_CACHE_MAX_AGE_SECONDS
+        )
+    }
+
+
+def save_head_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    write_json(HEAD_CACHE_PATH, cache)
+
+
+def head_cache_fresh(entry: Dict[str, Any]) -> bool:
+    return time.time() - entry.get("fetched_at", 0) < HEAD_CACHE_TTL_SECONDS
+
+
+def content_length_from_response(resp: requests.Response) -> Optional[int]:
+    """Full size of the resource, from Content-Range for a ranged response."""
+    if resp.status_code == 206:
+        total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    length = resp.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else None
+
+
+def cached_head(
+    head_cache: Optional[Dict[str, Dict[str, Any]]],
     url: str,
-    timeout: int,
-    headers: Optional[Dict[str, str]] = None,
-    *,
-    retry_max: int,
-    backoff_base: float,
-    limiter: RateLimiter,
-) -> Optional[int]:
-    try:
-        resp = request_with_retry(
-            session,
-            "HEAD",
-            url,
-            timeout=timeout,
-            headers=headers,
-            retry_max=retry_max,
-            backoff_base=backoff_base,
-            limiter=limiter,
+    headers: Optional[Dict[str, str]],
+    send: Callable[[str, Optional[Dict[str, str]]], requests.Response],
+) -> Optional[Dict[str, Any]]:
+    """HEAD url through head_cache: fresh entries are reused, expired ones are revalidated.
+
+    Servers that reject HEAD are asked again with a one-byte ranged GET, whose body
+    is never read.
+
+    Args:
+        head_cache: url -> cached entry; None disables caching.
+        send: Issues a request with the given method and headers (GETs streamed);
+            its exceptions propagate.
+
+    Returns:
+        The entry (etag, last_modified, content_type, content_length, fetched_at),
+        or None if the server answered with an error status.
+    """
+    entry = head_cache.get(url) if head_cache is not None else None
+    if entry and head_cache_fresh(entry):
+        return entry
+    request_headers = headers
+    if entry:
+        request_headers = conditional_headers(
+            headers or {}, etag=entry.get("etag", ""), last_modified=entry.get("last_modified", "")
         )
-        if resp.ok and resp.headers.get("Content-Length"):
-            return int(resp.headers["Content-Length"])
-    except Exception:
+    resp = send("HEAD", request_headers)
+    if resp.status_code in HEAD_REJECTED_STATUSES:
+        resp = send("GET", {**(request_headers or {}), "Range": "bytes=0-0"})
+        release_response(resp)
+    if entry and resp.status_code == 304:
+        entry = {**entry, "fetched_at": time.time()}
+    elif resp.status_code < 400:
+        entry = {
+            "etag": resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+            "content_type": resp.headers.get("Content-Type", ""),
+            "content_length": content_length_from_response(resp),
+            "fetched_at": time.time(),
+        }
+    else:
         return None
-    return None
+    if head_cache is not None:
+        head_cache[url] = entry
+    return entry
+
+
+class DownloadTooLarge(Exception):
+    """Raised by download_file when a body grows past its max_size."""
+
+    def __init__(self, size: int) -> None:
+        super().__init__(f"download exceeded {size} bytes")
+        self.size = size
+
+
+class HashingWriter:
+    """Write-only file wrapper that hashes and counts the bytes written through it.
+
+    download_file copies into one so the file is not read back just to hash it.
+    """
+
+    def __init__(self, f: Any, max_size: Optional[int] = None) -> None:
+        self._f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.max_size = max_size
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise DownloadTooLarge(self.size)
+        if len(self.head) < SNIFF_BYTES:
+            self.head += data[: SNIFF_BYTES - len(self.head)]
+        self.digest.update(data)
+        return self._f.write(data)
 
 
 def download_file(
@@ -347,9 +566,15 @@ def download_file(
     retry_max: int,
     backoff_base: float,
     limiter: RateLimiter,
+    max_size: Optional[int] = None,
 ) -> DownloadResult:
+    """Stream url to dest.
+
+    Raises:
+        DownloadTooLarge: The body is past max_size, by its Content-Length or while
+            streaming; nothing is left at dest.
+    """
     dest.parent.mkdir(parents=True, exist_ok=True)
-    size = 0
     with request_with_retry(
         session,
         "GET",
@@ -366,31 +591,124 @@ def download_file(
         content_disposition = resp.headers.get("Content-Disposition", "")
         etag = resp.headers.get("ETag", "")
         last_modified = resp.headers.get("Last-Modified", "")
-        with dest.open("wb") as f:
-            for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    size += len(chunk)
-                    f.write(chunk)
+        if resp.status_code == 304:
+            # Answer to If-None-Match/If-Modified-Since headers: unchanged, no body
+            return DownloadResult(
+                size=0,
+                content_type=content_type,
+                content_disposition=content_disposition,
+                final_url=resp.url,
+                etag=etag,
+                last_modified=last_modified,
+                not_modified=True,
+            )
+        length = content_length_from_response(resp)
+        if max_size is not None and length is not None and length > max_size:
+            # Too large by its own account; leaving the with block closes the body unread
+            raise DownloadTooLarge(length)
+        # Copy straight from the raw stream in large blocks; decode_content still undoes gzip
+        resp.raw.decode_content = True
+        # Written under a temporary name and renamed when complete, so an interrupted
+        # transfer never leaves a truncated file at dest
+        with tempfile.NamedTemporaryFile(
+            dir=dest.parent, prefix=f".{dest.name}.", suffix=".part", delete=False
+        ) as f:
+            part_path = Path(f.name)
+        try:
+            with part_path.open("wb") as f:
+                sink = HashingWriter(f, max_size)
+                shutil.copyfileobj(resp.raw, sink, DOWNLOAD_BUFFER_SIZE)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part_path, dest)
+        finally:
+            part_path.unlink(missing_ok=True)
     return DownloadResult(
-        size=size,
+        size=sink.size,
         content_type=content_type,
         content_disposition=content_disposition,
         final_url=resp.url,
         etag=etag,
         last_modified=last_modified,
+        sha256=sink.digest.hexdigest(),
+        head=sink.head,
     )
 
 
+def fetch_discovered_file(
+    session: requests.Session,
+    url: str,
+    dest: Path,
+    headers: Dict[str, str],
+    requester: RequestContext,
+    *,
+    etag: str = "",
+    last_modified: str = "",
+    size_cap: Optional[int] = None,
+) -> FetchOutcome:
+    """Network side of ingesting one file; touches no shared catalog or state, so it runs in worker threads.
+
+    Args:
+        etag, last_modified: Validators of the catalog entry already holding url; they make
+            the download conditional, so an unchanged file comes back as a bodiless 304.
+        size_cap: Bytes left under the size limits (None if there are none); the GET
+            is dropped once its Content-Length or body shows the file is larger.
+    """
+    # The size check rides on the GET's own headers, so there is no separate HEAD request
+    try:
+        result = download_file(
+            session,
+            url,
+            dest,
+            requester.timeout,
+            headers=conditional_headers(headers, etag=etag, last_modified=last_modified),
+            retry_max=requester.retry_max,
+            backoff_base=requester.backoff_base,
+            limiter=requester.limiter,
+            max_size=size_cap,
+        )
+    except DownloadTooLarge as exc:
+        return FetchOutcome(est_size=exc.size)
+    except requests.HTTPError as exc:
+        status = status_code_from_http_error(exc)
+        if status in {403, 404}:
+            return FetchOutcome(failed_status=status)
+        raise
+    if result.not_modified:
+        return FetchOutcome(not_modified=True)
+    # Limits are checked again against the bytes actually stored
+    est_size = result.size
+    blocked = is_blocked_response(result, dest)
+    if blocked:
+        return FetchOutcome(est_size=est_size, result=result, blocked=blocked)
+    sha = result.sha256 or sha256_file(dest)
+    # Page counting is CPU work; done here it overlaps with the other workers' downloads
+    pages = count_pdf_pages(dest) if b"%PDF-" in result.head else None
+    return FetchOutcome(est_size=est_size, result=result, path=dest, sha=sha, pages=pages)
+
+
 def count_pdf_pages(path: Path) -> int | None:
+    if HAS_PIKEPDF:
+        try:
+            with pikepdf.open(str(path)) as pdf:
+                return len(pdf.pages)
+        except Exception:
+            # pypdf recovers some files qpdf rejects
+            pass
     try:
-        reader = PdfReader(str(path))
-        return len(reader.pages)
+        with path.open("rb") as f:
+            reader = PdfReader(f, strict=False)
+            # The page tree's /Count; len(reader.pages) would walk and flatten the whole tree
+            count = reader.trailer["/Root"]["/Pages"].get("/Count")
+            if isinstance(count, int) and count > 0:
+                return int(count)
+            return len(reader.pages)
     except Exception:
         return None
 
 
 def extract_year(text: str) -> str:
-    match = re.search(r"(19|20)\d{2}", text)
+    match = _YEAR_RE.search(text)
     if match:
         return match.group(0)
     return ""
@@ -399,7 +717,7 @@ def extract_year(text: str) -> str:
 def filename_from_disposition(disposition: str) -> str:
     if not disposition:
         return ""
-    match = re.search(r'filename="?([^";]+)"?', disposition)
+    match = _DISPOSITION_FILENAME_RE.search(disposition)
     if match:
         return match.group(1)
     return ""
@@ -422,13 +740,17 @@ def extension_from_content_type(content_type: str) -> str:
     return ""
 
 
-def is_html_file(path: Path, content_type: str) -> bool:
+def is_html_file(path: Path, content_type: str, head: bytes = b"") -> bool:
+    """head: the file's first bytes if already at hand; otherwise they are read from path."""
     if "text/html" in (content_type or "").lower():
         return True
-    try:
-        head = path.read_bytes()[:200].lstrip()
-    except Exception:
-        return False
+    if not head:
+        try:
+            with path.open("rb") as f:
+                head = f.read(SNIFF_BYTES)
+        except Exception:
+            return False
+    head = head.lstrip()
     return head.startswith(b"<!DOCTYPE html") or head.startswith(b"<html")
 
 
@@ -436,7 +758,7 @@ def is_blocked_response(result: DownloadResult, path: Path) -> Optional[SkipReas
     content_type = (result.content_type or "").lower()
     if "text/html" in content_type:
         return SkipReason(reason="html_response", detail=content_type)
-    if result.size < 4096 and is_html_file(path, content_type):
+    if result.size < 4096 and is_html_file(path, content_type, result.head):
         return SkipReason(reason="html_body", detail="small_html_body")
     return None
 
@@ -454,42 +776,33 @@ def response_is_not_found(resp: requests.Response) -> bool:
     content_type = resp.headers.get("Content-Type", "").lower()
     if "text/html" not in content_type:
         return False
-    text = resp.text.lower()
-    return "page not found" in text or "404" in text[:2000]
+    content_length = resp.headers.get("Content-Length", "")
+    if content_length.isdigit() and int(content_length) > NOT_FOUND_SCAN_MAX_BYTES:
+        return False
+    text = resp.text
+    # Searched case-insensitively rather than lowercasing a copy of the whole body
+    return "404" in text[:2000] or _PAGE_NOT_FOUND_RE.search(text) is not None
 
 
-def conditional_head(
-    session: requests.Session,
-    url: str,
-    timeout: int,
-    headers: Dict[str, str],
-    *,
-    etag: str = "",
-    last_modified: str = "",
-    retry_max: int,
-    backoff_base: float,
-    limiter: RateLimiter,
-) -> Optional[requests.Response]:
-    conditional_headers = dict(headers)
+def revalidation_validators(entry: Dict[str, Any]) -> Dict[str, str]:
+    """etag/last_modified for fetch_discovered_file from the catalog entry already holding a URL.
+
+    Empty when the entry's file is not on disk: a 304 would then leave nothing to keep.
+    """
+    file_path = entry.get("file_path")
+    if not file_path or not Path(file_path).is_file():
+        return {"etag": "", "last_modified": ""}
+    return {"etag": entry.get("etag", ""), "last_modified": entry.get("last_modified", "")}
+
+
+def conditional_headers(headers: Dict[str, str], *, etag: str = "", last_modified: str = "") -> Dict[str, str]:
+    """Request headers plus If-None-Match/If-Modified-Since for the validators that are set."""
+    request_headers = dict(headers)
     if etag:
-        conditional_headers["If-None-Match"] = etag
+        request_headers["If-None-Match"] = etag
     if last_modified:
-        conditional_headers["If-Modified-Since"] = last_modified
-    if not etag and not last_modified:
-        return None
-    try:
-        return request_with_retry(
-            session,
-            "HEAD",
-            url,
-            timeout=timeout,
-            headers=conditional_headers,
-            retry_max=retry_max,
-            backoff_base=backoff_base,
-            limiter=limiter,
-        )
-    except requests.RequestException:
-        return None
+        request_headers["If-Modified-Since"] = last_modified
+    return request_headers
 
 
 def resolve_hub_targets(
@@ -522,25 +835,34 @@ def resolve_source_base_url(
     timeout: int,
     hub_cache: Dict[str, Dict[str, str]],
     requester: Optional[RequestContext] = None,
+    hub_lock: Optional[threading.Lock] = None,
 ) -> str:
+    """Base URL to crawl for source, preferring its target on the DoJ hub page if it has one.
+
+    Args:
+        hub_cache: hub_url -> targets, shared between sources so each hub is fetched once.
+        hub_lock: Guards hub_cache when sources are resolved from several threads; held
+            only while a hub is looked up or fetched.
+    """
     hub_target = source.discovery.get("hub_target")
     hub_url = source.discovery.get("hub_url")
     if not hub_target or not hub_url:
         return source.base_url
-    targets = hub_cache.get(hub_url)
-    if targets is None:
-        try:
-            targets = resolve_hub_targets(
-                session,
-                hub_url,
-                timeout,
-                headers=source_headers(source),
-                requester=requester,
-            )
-        except requests.RequestException as exc:
-            print(f"[ingest] hub discovery failed: {hub_url} ({exc})")
-            targets = {}
-        hub_cache[hub_url] = targets
+    with hub_lock or nullcontext():
+        targets = hub_cache.get(hub_url)
+        if targets is None:
+            try:
+                targets = resolve_hub_targets(
+                    session,
+                    hub_url,
+                    timeout,
+                    headers=source_headers(source),
+                    requester=requester,
+                )
+            except requests.RequestException as exc:
+                print(f"[ingest] hub discovery failed: {hub_url} ({exc})")
+                targets = {}
+            hub_cache[hub_url] = targets
     discovered = targets.get(hub_target)
     if not discovered:
         return source.base_url
@@ -576,6 +898,29 @@ def resolve_source_base_url(
     return discovered
 
 
+def discover_source(
+    session: requests.Session,
+    source: SourceConfig,
+    config: Dict[str, Any],
+    timeout: int,
+    hub_cache: Dict[str, Dict[str, str]],
+    hub_lock: threading.Lock,
+    requester: Optional[RequestContext] = None,
+) -> Optional[List[DiscoveredFile]]:
+    """Resolve a source's URL and run its adapter; None if discovery failed. Safe to run in threads."""
+    resolved_url = resolve_source_base_url(
+        session, source, timeout, hub_cache, requester=requester, hub_lock=hub_lock
+    )
+    if resolved_url != source.base_url:
+        source.base_url = resolved_url
+    adapter = adapter_for(source, config, requester=requester)
+    try:
+        return adapter.discover(session)
+    except requests.RequestException as exc:
+        print(f"[ingest] {source.id}: discovery failed ({exc})")
+        return None
+
+
 def skip_reason_for_source(source: SourceConfig, cookie_jar: Optional[CookieJar]) -> Optional[SkipReason]:
     if source.requires_cookies and not cookie_jar:
         return SkipReason(reason="cookie_required", detail="cookie jar missing")
@@ -625,29 +970,79 @@ class SourceAdapter:
         }
         return any(token in content_type for token in allowed_types)
 
-    def _multimedia_allowed_by_head(
+    def _head_content_type(
         self,
         session: requests.Session,
         url: str,
         headers: Optional[Dict[str, str]],
-    ) -> bool:
-        try:
+    ) -> str:
+        """Content-Type reported by a HEAD of url; empty if the request failed."""
+
+        def send(method: str, request_headers: Optional[Dict[str, str]]) -> requests.Response:
             if self.requester:
-                resp = request_with_retry(
+                return request_with_retry(
                     session,
-                    "HEAD",
+                    method,
                     url,
                     timeout=self.requester.timeout,
-                    headers=headers,
+                    headers=request_headers,
                     retry_max=self.requester.retry_max,
                     backoff_base=self.requester.backoff_base,
                     limiter=self.requester.limiter,
+                    stream=method == "GET",
                 )
-            else:
-                resp = session.head(url, timeout=120, headers=headers, allow_redirects=True)
+            if method == "GET":
+                return session.get(url, timeout=120, headers=request_headers, stream=True)
+            return session.head(url, timeout=120, headers=request_headers, allow_redirects=True)
+
+        head_cache = self.requester.head_cache if self.requester else None
+        try:
+            entry = cached_head(head_cache, url, headers, send)
         except requests.RequestException:
-            return False
-        return self._content_type_allowed(resp.headers.get("Content-Type", ""))
+            return ""
+        return entry["content_type"] if entry else ""
+
+    def _multimedia_allowed_by_head(
+        self,
+        session: requests.Session,
+        url: str,
+        headers: Optional[Dict[str, str]],
+    ) -> bool:
+        return self._content_type_allowed(self._head_content_type(session, url, headers))
+
+    def _needs_head_probe(self, url: str, link_text: str) -> bool:
+        return (
+            self._is_relevant_file_link(url)
+            and not self._allowed(url)
+            and "/multimedia/" in urlparse(url).path.lower()
+            and not self._anchor_has_allowed_extension(link_text)
+        )
+
+    def _probe_content_types(
+        self,
+        session: requests.Session,
+        links: List[Dict[str, str]],
+        page_url: str,
+        headers: Optional[Dict[str, str]],
+    ) -> Dict[str, str]:
+        """HEAD the links whose type only a HEAD can tell, max_concurrency at a time.
+
+        Returns:
+            Content-Type per probed URL, for _should_include_link.
+        """
+        # A dict keeps first-seen order with constant-time duplicate checks
+        probe: Dict[str, None] = {}
+        for link in links:
+            url = normalize_url(page_url, link["href"])
+            if url not in probe and self._needs_head_probe(url, link.get("text", "")):
+                probe[url] = None
+        if not probe:
+            return {}
+        urls = list(probe)
+        workers = min(select_concurrency(self.config), len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            content_types = list(pool.map(lambda url: self._head_content_type(session, url, headers), urls))
+        return dict(zip(urls, content_types))
 
     def _should_include_link(
         self,
@@ -655,6 +1050,7 @@ class SourceAdapter:
         url: str,
         link_text: str,
         headers: Optional[Dict[str, str]],
+        content_types: Optional[Dict[str, str]] = None,
     ) -> bool:
         if not self._is_relevant_file_link(url):
             return False
@@ -663,6 +1059,8 @@ class SourceAdapter:
         if "/multimedia/" in urlparse(url).path.lower():
             if self._anchor_has_allowed_extension(link_text):
                 return True
+            if content_types is not None and url in content_types:
+                return self._content_type_allowed(content_types[url])
             return self._multimedia_allowed_by_head(session, url, headers)
         return False
 
@@ -671,9 +1069,10 @@ class SourceAdapter:
         session: requests.Session,
         url: str,
         headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
     ) -> requests.Response:
         if not self.requester:
-            return session.get(url, timeout=120, headers=headers)
+            return session.get(url, timeout=120, headers=headers, stream=stream)
         return request_with_retry(
             session,
             "GET",
@@ -683,14 +1082,15 @@ class SourceAdapter:
             retry_max=self.requester.retry_max,
             backoff_base=self.requester.backoff_base,
             limiter=self.requester.limiter,
+            stream=stream,
         )
 
 
 class DojHubAdapter(SourceAdapter):
     def discover(self, session: requests.Session) -> List[DiscoveredFile]:
-        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source))
+        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source), stream=True)
         resp.raise_for_status()
-        links = collect_links(resp.text)
+        links = collect_links_stream(resp)
         files: List[DiscoveredFile] = []
         for link in links:
             url = normalize_url(self.source.base_url, link["href"])
@@ -712,9 +1112,9 @@ class DojHubAdapter(SourceAdapter):
 class DojDisclosuresAdapter(SourceAdapter):
     def discover(self, session: requests.Session) -> List[DiscoveredFile]:
         timeout = int(self.config.get("defaults", {}).get("timeout_seconds", 120))
-        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source))
+        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source), stream=True)
         resp.raise_for_status()
-        links = collect_links(resp.text)
+        links = collect_links_stream(resp)
         dataset_pages = [
             normalize_url(self.source.base_url, link["href"])
             for link in links
@@ -751,12 +1151,12 @@ class DojDisclosuresAdapter(SourceAdapter):
         while next_url and next_url not in visited:
             visited.add(next_url)
             try:
-                resp = self.fetch(session, next_url, headers=source_headers(self.source))
+                resp = self.fetch(session, next_url, headers=source_headers(self.source), stream=True)
                 resp.raise_for_status()
             except requests.RequestException as exc:
                 print(f"[ingest] dataset page fetch failed: {next_url} ({exc})")
                 break
-            links = collect_links(resp.text)
+            links = collect_links_stream(resp)
             page_title = next(
                 (link["heading"] for link in links if link["heading"]), ""
             )
@@ -796,7 +1196,7 @@ class DojCourtRecordsAdapter(SourceAdapter):
     def discover(self, session: requests.Session) -> List[DiscoveredFile]:
         timeout = int(self.config.get("defaults", {}).get("timeout_seconds", 120))
         headers = source_headers(self.source)
-        resp = self.fetch(session, self.source.base_url, headers=headers)
+        resp = self.fetch(session, self.source.base_url, headers=headers, stream=True)
         if resp.status_code == 403 and playwright_discovery_enabled():
             urls = discover_with_playwright(
                 [self.source.base_url],
@@ -813,7 +1213,7 @@ class DojCourtRecordsAdapter(SourceAdapter):
                 for url in urls
             ]
         resp.raise_for_status()
-        links = collect_links(resp.text)
+        links = collect_links_stream(resp)
 
         subpages = [
             normalize_url(self.source.base_url, link["href"])
@@ -826,9 +1226,9 @@ class DojCourtRecordsAdapter(SourceAdapter):
         for page in subpages:
             if page == self.source.base_url:
                 continue
-            sub_resp = self.fetch(session, page, headers=source_headers(self.source))
+            sub_resp = self.fetch(session, page, headers=source_headers(self.source), stream=True)
             sub_resp.raise_for_status()
-            sub_links = collect_links(sub_resp.text)
+            sub_links = collect_links_stream(sub_resp)
             files.extend(self._parse_court_links(session, sub_links, page))
 
         return files
@@ -838,10 +1238,11 @@ class DojCourtRecordsAdapter(SourceAdapter):
     ) -> List[DiscoveredFile]:
         discovered: List[DiscoveredFile] = []
         headers = source_headers(self.source)
+        content_types = self._probe_content_types(session, links, page_url, headers)
         for link in links:
             url = normalize_url(page_url, link["href"])
             link_text = link.get("text", "")
-            if not self._should_include_link(session, url, link_text, headers):
+            if not self._should_include_link(session, url, link_text, headers, content_types):
                 continue
             heading = link["heading"] or "Court Records"
             title_text = link["text"].strip() or Path(urlparse(url).path).name
@@ -864,7 +1265,7 @@ class DojFoiaAdapter(SourceAdapter):
     def discover(self, session: requests.Session) -> List[DiscoveredFile]:
         timeout = int(self.config.get("defaults", {}).get("timeout_seconds", 120))
         headers = source_headers(self.source)
-        resp = self.fetch(session, self.source.base_url, headers=headers)
+        resp = self.fetch(session, self.source.base_url, headers=headers, stream=True)
         if resp.status_code == 403 and playwright_discovery_enabled():
             urls = discover_with_playwright(
                 [self.source.base_url],
@@ -881,12 +1282,13 @@ class DojFoiaAdapter(SourceAdapter):
                 for url in urls
             ]
         resp.raise_for_status()
-        links = collect_links(resp.text)
+        links = collect_links_stream(resp)
         files: List[DiscoveredFile] = []
+        content_types = self._probe_content_types(session, links, self.source.base_url, headers)
         for link in links:
             url = normalize_url(self.source.base_url, link["href"])
             link_text = link.get("text", "")
-            if not self._should_include_link(session, url, link_text, headers):
+            if not self._should_include_link(session, url, link_text, headers, content_types):
                 continue
             heading = link["heading"] or "FOIA"
             title_text = link["text"].strip() or Path(urlparse(url).path).name
@@ -905,9 +1307,9 @@ class DojFoiaAdapter(SourceAdapter):
 
 class OpaPressReleaseAdapter(SourceAdapter):
     def discover(self, session: requests.Session) -> List[DiscoveredFile]:
-        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source))
+        resp = self.fetch(session, self.source.base_url, headers=source_headers(self.source), stream=True)
         resp.raise_for_status()
-        links = collect_links(resp.text)
+        links = collect_links_stream(resp)
         files: List[DiscoveredFile] = []
         for link in links:
             url = normalize_url(self.source.base_url, link["href"])
@@ -994,9 +1396,7 @@ def build_sources(config: Dict[str, Any]) -> List[SourceConfig]:
 
 
 def load_state() -> Dict[str, Any]:
-    if not STATE_PATH.exists():
-        return {}
-    return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    return load_json(STATE_PATH, {})
 
 
 def save_state(state: Dict[str, Any]) -> None:
@@ -1014,6 +1414,7 @@ def select_limits(config: Dict[str, Any]) -> Dict[str, int]:
         "max_bytes": int(env_limits.get("max_bytes_per_source", 0)),
         "max_bytes_run": int(env_max_bytes) if env_max_bytes else 0,
         "max_attempts": int(env_limits.get("max_attempts_per_source", 0)),
+        "max_file_bytes": int(config.get("defaults", {}).get("max_file_size_bytes", 0)),
     }
 
 
@@ -1037,7 +1438,10 @@ def ingest() -> None:
     throttle = select_throttle(config)
     timeout = int(config.get("defaults", {}).get("timeout_seconds", 120))
     session = build_session(config)
-    limiter = RateLimiter(throttle["requests_per_second"])
+    workers = select_concurrency(config)
+    limiter = HostRateLimiter(
+        throttle["requests_per_second"], config.get("defaults", {}).get("per_host_rps", {})
+    )
     retry_max = int(throttle["retry_max"])
     backoff_base = float(throttle["backoff_base"])
     time_budget = float(throttle["time_budget"])
@@ -1047,7 +1451,9 @@ def ingest() -> None:
         retry_max=retry_max,
         backoff_base=backoff_base,
         limiter=limiter,
+        head_cache=load_head_cache(),
     )
+    head_cache_before = dict(request_context.head_cache)
     cookie_jar = load_cookie_jar()
     if cookie_jar:
         session.cookies = cookie_jar
@@ -1059,7 +1465,7 @@ def ingest() -> None:
     hub_cache: Dict[str, Dict[str, str]] = {}
 
     catalog = load_catalog()
-    by_sha = {entry["sha256"]: entry for entry in catalog}
+    by_sha = index_by_sha(catalog)
     by_url: Dict[str, Dict[str, Any]] = {}
     for entry in catalog:
         if entry.get("source_url"):
@@ -1070,289 +1476,310 @@ def ingest() -> None:
                 by_url[url] = entry
     updated = False
 
-    for source in sources:
-        if run_bytes_limit and run_bytes_used >= run_bytes_limit:
-            break
-        skip_reason = skip_reason_for_source(source, cookie_jar)
-        if skip_reason:
-            print(
-                "[ingest] skip gated source "
-                f"reason={skip_reason.reason} url={source.base_url}"
-            )
-            continue
+    # Discovery is page fetches only, so sources are discovered concurrently, ahead of
+    # the downloads; the loop below waits for each source's result when it gets there
+    hub_lock = threading.Lock()
+
+    def discover_in_budget(source: SourceConfig) -> Optional[List[DiscoveredFile]]:
+        # The run would stop before downloading anything this discovery finds
         if time_budget and (time.monotonic() - started_at) >= time_budget:
-            print("[ingest] time budget reached; stopping run")
-            break
-        resolved_url = resolve_source_base_url(
-            session, source, timeout, hub_cache, requester=request_context
-        )
-        if resolved_url != source.base_url:
-            source.base_url = resolved_url
-        adapter = adapter_for(source, config, requester=request_context)
-        try:
-            discovered = adapter.discover(session)
-        except requests.RequestException as exc:
-            print(f"[ingest] {source.id}: discovery failed ({exc})")
-            continue
-        discovered = sorted({d.url: d for d in discovered}.values(), key=lambda d: d.url)
-        max_docs = limits.get("max_docs", 0)
-        max_bytes = limits.get("max_bytes", 0)
-        max_attempts = limits.get("max_attempts", 0)
-        total_bytes = 0
-        downloaded = 0
-        new_docs = 0
-        attempted = 0
-        skipped_nonfile = 0
-        source_state = state.get(source.id, {})
-        cursor = int(source_state.get("cursor", 0))
-        seen_urls = set(source_state.get("seen_urls", []))
-        failed_urls = dict(source_state.get("failed_urls", {}))
-        if cursor >= len(discovered):
-            cursor = 0
-        print(f"[ingest] {source.id}: discovered {len(discovered)} files")
-
-        for idx, item in enumerate(discovered[cursor:], start=cursor):
-            if time_budget and (time.monotonic() - started_at) >= time_budget:
-                print("[ingest] time budget reached; stopping run")
-                break
-            if max_attempts and attempted >= max_attempts:
-                break
-            if max_docs and downloaded >= max_docs:
-                break
-            if max_bytes and total_bytes >= max_bytes:
-                break
+            return None
+        return discover_source(session, source, config, timeout, hub_cache, hub_lock, requester=request_context)
+
+    discovery_executor = ThreadPoolExecutor(max_workers=workers)
+    discoveries = {
+        source.id: discovery_executor.submit(discover_in_budget, source)
+        for source in sources
+        if not skip_reason_for_source(source, cookie_jar)
+    }
+
+    try:
+        for source in sources:
             if run_bytes_limit and run_bytes_used >= run_bytes_limit:
                 break
-            if item.url in seen_urls:
-                continue
-            attempted += 1
-            state[source.id] = {"cursor": idx + 1}
-            state_changed = True
-
-            headers = source_headers(source)
-            existing_by_url = by_url.get(item.url)
-            if existing_by_url:
-                conditional = conditional_head(
-                    session,
-                    item.url,
-                    timeout,
-                    headers,
-                    etag=existing_by_url.get("etag", ""),
-                    last_modified=existing_by_url.get("last_modified", ""),
-                    retry_max=retry_max,
-                    backoff_base=backoff_base,
-                    limiter=limiter,
+            skip_reason = skip_reason_for_source(source, cookie_jar)
+            if skip_reason:
+                print(
+                    "[ingest] skip gated source "
+                    f"reason={skip_reason.reason} url={source.base_url}"
                 )
-                if conditional is not None and conditional.status_code == 304:
-                    seen_urls.add(item.url)
-                    state[source.id] = {
-                        "cursor": idx + 1,
-                        "seen_urls": sorted(seen_urls),
-                        "failed_urls": failed_urls,
-                        "last_run": utc_now_iso(),
-                    }
-                    state_changed = True
-                    continue
-
-            est_size = estimate_size(
-                session,
-                item.url,
-                timeout,
-                headers=headers,
-                retry_max=retry_max,
-                backoff_base=backoff_base,
-                limiter=limiter,
-            )
-            if max_bytes and est_size and total_bytes + est_size > max_bytes:
-                print(f"[ingest] skip (size cap) {item.url}")
                 continue
-            if run_bytes_limit and est_size and run_bytes_used + est_size > run_bytes_limit:
-                print(f"[ingest] skip (run size cap) {item.url}")
+            if time_budget and (time.monotonic() - started_at) >= time_budget:
+                print("[ingest] time budget reached; stopping run")
+                break
+            discovered = discoveries[source.id].result()
+            if discovered is None:
                 continue
-
-            filename = Path(urlparse(item.url).path).name or f"document-{downloaded}.bin"
-            with tempfile.TemporaryDirectory(prefix="epstein-ingest-") as tmpdir:
-                tmp_path = Path(tmpdir) / filename
-                try:
-                    result = download_file(
-                        session,
-                        item.url,
-                        tmp_path,
-                        timeout,
-                        headers=headers,
-                        retry_max=retry_max,
-                        backoff_base=backoff_base,
-                        limiter=limiter,
-                    )
-                except requests.HTTPError as exc:
-                    status = status_code_from_http_error(exc)
-                    if status in {403, 404}:
-                        print(f"[ingest] skip status={status} url={item.url}")
-                        failed_urls[item.url] = {"status": status, "at": utc_now_iso()}
-                        state[source.id] = {
-                            "cursor": idx + 1,
-                            "seen_urls": sorted(seen_urls),
-                            "failed_urls": failed_urls,
-                            "last_run": utc_now_iso(),
-                        }
-                        state_changed = True
-                        continue
-                    raise
-                blocked = is_blocked_response(result, tmp_path)
-                if blocked:
-                    skipped_nonfile += 1
-                    if skipped_nonfile <= 5:
-                        print(
-                            "[ingest] skip gated response "
-                            f"url={item.url} reason={blocked.reason} detail={blocked.detail}"
+            discovered = sorted({d.url: d for d in discovered}.values(), key=lambda d: d.url)
+            max_docs = limits.get("max_docs", 0)
+            max_bytes = limits.get("max_bytes", 0)
+            max_attempts = limits.get("max_attempts", 0)
+            max_file_bytes = limits.get("max_file_bytes", 0)
+            total_bytes = 0
+            downloaded = 0
+            new_docs = 0
+            attempted = 0
+            skipped_nonfile = 0
+            source_state = state.get(source.id, {})
+            cursor = int(source_state.get("cursor", 0))
+            seen_urls = set(source_state.get("seen_urls", []))
+            failed_urls = dict(source_state.get("failed_urls", {}))
+            # Shared by every fetch for the source; fetch_discovered_file only copies it
+            download_headers = source_headers(source)
+            # State is only written back once per source, after the loop
+            next_cursor = source_state.get("cursor", cursor)
+            if cursor >= len(discovered):
+                cursor = 0
+            print(f"[ingest] {source.id}: discovered {len(discovered)} files")
+
+            # The temp dir sits next to RAW_DIR so moving a finished download into it is a rename, not a copy
+            RAW_DIR.parent.mkdir(parents=True, exist_ok=True)
+            # Downloads (with their HEAD checks and hashing) run ahead in worker threads;
+            # results are recorded strictly in discovery order on this thread, so the
+            # catalog, state, and limits behave as in a serial run.
+            with tempfile.TemporaryDirectory(prefix="epstein-ingest-", dir=RAW_DIR.parent) as tmpdir, ThreadPoolExecutor(
+                max_workers=workers
+            ) as executor:
+                pending: deque = deque()
+                position = cursor
+                out_of_time = False
+                while True:
+                    while not out_of_time and position < len(discovered) and len(pending) < workers:
+                        if time_budget and (time.monotonic() - started_at) >= time_budget:
+                            print("[ingest] time budget reached; stopping run")
+                            out_of_time = True
+                            break
+                        # Counters include in-flight fetches so limits are not overshot
+                        if max_attempts and attempted + len(pending) >= max_attempts:
+                            break
+                        if max_docs and downloaded + len(pending) >= max_docs:
+                            break
+                        if max_bytes and total_bytes >= max_bytes:
+                            break
+                        if run_bytes_limit and run_bytes_used >= run_bytes_limit:
+                            break
+                        idx, item = position, discovered[position]
+                        position += 1
+                        if item.url in seen_urls:
+                            continue
+                        existing_by_url = by_url.get(item.url) or {}
+                        size_caps = [
+                            limit - used
+                            for limit, used in (
+                                (max_bytes, total_bytes),
+                                (run_bytes_limit, run_bytes_used),
+                                (max_file_bytes, 0),
+                            )
+                            if limit
+                        ]
+                        filename = Path(urlparse(item.url).path).name or f"document-{downloaded + len(pending)}.bin"
+                        item_dir = Path(tempfile.mkdtemp(dir=tmpdir))
+                        future = executor.submit(
+                            fetch_discovered_file,
+                            session,
+                            item.url,
+                            item_dir / filename,
+                            download_headers,
+                            request_context,
+                            **revalidation_validators(existing_by_url),
+                            size_cap=min(size_caps) if size_caps else None,
                         )
-                    continue
+                        pending.append((idx, item, filename, item_dir, future))
+                    if not pending:
+                        break
+
+                    idx, item, filename, item_dir, future = pending.popleft()
+                    # Earlier results may have used up a limit; fetches still in flight are dropped
+                    if max_attempts and attempted >= max_attempts:
+                        break
+                    if max_docs and downloaded >= max_docs:
+                        break
+                    if max_bytes and total_bytes >= max_bytes:
+                        break
+                    if run_bytes_limit and run_bytes_used >= run_bytes_limit:
+                        break
+                    try:
+                        outcome = future.result()
+                        attempted += 1
+                        next_cursor = idx + 1
+
+                        if outcome.not_modified:
+                            seen_urls.add(item.url)
+                            continue
+
+                        est_size = outcome.est_size
+                        if max_file_bytes and est_size and est_size > max_file_bytes:
+                            print(f"[ingest] skip (file size cap) {item.url} size={est_size}")
+                            continue
+                        if max_bytes and est_size and total_bytes + est_size > max_bytes:
+                            print(f"[ingest] skip (size cap) {item.url}")
+                            continue
+                        if run_bytes_limit and est_size and run_bytes_used + est_size > run_bytes_limit:
+                            print(f"[ingest] skip (run size cap) {item.url}")
+                            continue
+
+                        if outcome.failed_status:
+                            status = outcome.failed_status
+                            print(f"[ingest] skip status={status} url={item.url}")
+                            failed_urls[item.url] = {"status": status, "at": utc_now_iso()}
+                            continue
+                        result = outcome.result
+                        if outcome.blocked:
+                            blocked = outcome.blocked
+                            skipped_nonfile += 1
+                            if skipped_nonfile <= 5:
+                                print(
+                                    "[ingest] skip gated response "
+                                    f"url={item.url} reason={blocked.reason} detail={blocked.detail}"
+                                )
+                            continue
+
+                        tmp_path = outcome.path
+                        sha = outcome.sha
+                        existing = by_sha.get(sha)
+                        if existing:
+                            changed = False
+                            sources_before = len(existing.get("sources", []))
+                            ensure_sources(existing, source.name, item.source_page or source.base_url)
+                            if len(existing.get("sources", [])) != sources_before:
+                                changed = True
+
+                            new_source_url = result.final_url or item.url
+                            if existing.get("source_url") != new_source_url:
+                                existing["source_url"] = new_source_url
+                                changed = True
+
+                            if existing.get("title", "").lower() in {"here", ""} and item.title:
+                                existing["title"] = item.title
+                                changed = True
+
+                            if not existing.get("release_date") and item.release_date:
+                                existing["release_date"] = item.release_date
+                                changed = True
+
+                            if item.tags:
+                                new_tags = sorted(set(existing.get("tags", [])) | set(item.tags))
+                                if new_tags != existing.get("tags", []):
+                                    existing["tags"] = new_tags
+                                    changed = True
+                            source_page = item.source_page or source.base_url
+                            if source_page and existing.get("source_page") != source_page:
+                                existing["source_page"] = source_page
+                                changed = True
+
+                            if result.content_type and not existing.get("mime_type"):
+                                existing["mime_type"] = result.content_type
+                                changed = True
+                            if result.final_url and existing.get("source_url") != result.final_url:
+                                existing["source_url"] = result.final_url
+                                changed = True
+                            if result.content_disposition:
+                                existing["content_disposition"] = result.content_disposition
+                                changed = True
+                            if result.etag:
+                                existing["etag"] = result.etag
+                                changed = True
+                            if result.last_modified:
+                                existing["last_modified"] = result.last_modified
+                                changed = True
+                            if result.final_url:
+                                by_url[result.final_url] = existing
+                            # The catalog's copy went missing; the download is the same file
+                            existing_path = Path(existing.get("file_path", ""))
+                            if existing.get("file_path") and not existing_path.exists():
+                                existing_path.parent.mkdir(parents=True, exist_ok=True)
+                                shutil.move(str(tmp_path), existing_path)
+                                print(f"[ingest] restored missing file {existing_path}")
+
+                            if changed:
+                                existing["downloaded_at"] = utc_now_iso()
+                                write_json(Path("data/meta") / f"{existing['id']}.json", existing)
+                                updated = True
+
+                            total_bytes += result.size
+                            run_bytes_used += result.size
+                            downloaded += 1
+                            seen_urls.add(item.url)
+                            continue
+
+                        doc_id = f"{sha[:12]}-{slugify(item.title)}"
+                        raw_dir = RAW_DIR / doc_id
+                        raw_dir.mkdir(parents=True, exist_ok=True)
+                        header_name = filename_from_disposition(result.content_disposition)
+                        final_name = header_name or filename
+                        if final_name in {"dl", "download"} or "." not in final_name:
+                            ext = extension_from_content_type(result.content_type)
+                            final_name = f"{slugify(item.title)}{ext}" if ext else final_name
+                        dest_path = raw_dir / final_name
+                        shutil.move(str(tmp_path), dest_path)
+
+                        mime_type = detect_mime(dest_path)
+                        pages = None
+                        if dest_path.suffix.lower() == ".pdf":
+                            pages = outcome.pages if outcome.pages is not None else count_pdf_pages(dest_path)
+
+                        entry = {
+                            "id": doc_id,
+                            "title": item.title,
+                            "source_name": source.name,
+                            "source_url": result.final_url or item.url,
+                            "source_page": item.source_page or source.base_url,
+                            "release_date": item.release_date or "",
+                            "downloaded_at": utc_now_iso(),
+                            "sha256": sha,
+                            "file_path": str(dest_path),
+                            "mime_type": mime_type,
+                            "pages": pages,
+                            "tags": item.tags,
+                            "notes": item.notes or source.notes,
+                            "is_official": bool(source.is_official),
+                            "license_or_terms": "as published by source",
+                            "etag": result.etag,
+                            "last_modified": result.last_modified,
+                            "content_disposition": result.content_disposition,
+                            "sources": [
+                                {
+                                    "source_name": source.name,
+                                    "source_url": item.source_page or source.base_url,
+                                }
+                            ],
+                        }
 
-                sha = sha256_file(tmp_path)
-                existing = by_sha.get(sha)
-                if existing:
-                    changed = False
-                    sources_before = len(existing.get("sources", []))
-                    ensure_sources(existing, source.name, item.source_page or source.base_url)
-                    if len(existing.get("sources", [])) != sources_before:
-                        changed = True
-
-                    new_source_url = result.final_url or item.url
-                    if existing.get("source_url") != new_source_url:
-                        existing["source_url"] = new_source_url
-                        changed = True
-
-                    if existing.get("title", "").lower() in {"here", ""} and item.title:
-                        existing["title"] = item.title
-                        changed = True
-
-                    if not existing.get("release_date") and item.release_date:
-                        existing["release_date"] = item.release_date
-                        changed = True
-
-                    if item.tags:
-                        new_tags = sorted(set(existing.get("tags", [])) | set(item.tags))
-                        if new_tags != existing.get("tags", []):
-                            existing["tags"] = new_tags
-                            changed = True
-                    source_page = item.source_page or source.base_url
-                    if source_page and existing.get("source_page") != source_page:
-                        existing["source_page"] = source_page
-                        changed = True
-
-                    if result.content_type and not existing.get("mime_type"):
-                        existing["mime_type"] = result.content_type
-                        changed = True
-                    if result.final_url and existing.get("source_url") != result.final_url:
-                        existing["source_url"] = result.final_url
-                        changed = True
-                    if result.content_disposition:
-                        existing["content_disposition"] = result.content_disposition
-                        changed = True
-                    if result.etag:
-                        existing["etag"] = result.etag
-                        changed = True
-                    if result.last_modified:
-                        existing["last_modified"] = result.last_modified
-                        changed = True
-                    if result.final_url:
-                        by_url[result.final_url] = existing
-
-                    if changed:
-                        existing["downloaded_at"] = utc_now_iso()
-                        write_json(Path("data/meta") / f"{existing['id']}.json", existing)
+                        write_json(Path("data/meta") / f"{doc_id}.json", entry)
+                        catalog.append(entry)
+                        by_sha[sha] = entry
+                        by_url[entry["source_url"]] = entry
                         updated = True
+                        new_docs += 1
+                        total_bytes += result.size
+                        run_bytes_used += result.size
+                        downloaded += 1
+                        seen_urls.add(item.url)
+                    finally:
+                        shutil.rmtree(item_dir, ignore_errors=True)
 
-                    total_bytes += result.size
-                    run_bytes_used += result.size
-                    downloaded += 1
-                    seen_urls.add(item.url)
-                    state[source.id] = {
-                        "cursor": idx + 1,
-                        "seen_urls": sorted(seen_urls),
-                        "failed_urls": failed_urls,
-                        "last_run": utc_now_iso(),
-                    }
-                    state_changed = True
-                    continue
-
-                doc_id = f"{sha[:12]}-{slugify(item.title)}"
-                raw_dir = RAW_DIR / doc_id
-                raw_dir.mkdir(parents=True, exist_ok=True)
-                header_name = filename_from_disposition(result.content_disposition)
-                final_name = header_name or filename
-                if final_name in {"dl", "download"} or "." not in final_name:
-                    ext = extension_from_content_type(result.content_type)
-                    final_name = f"{slugify(item.title)}{ext}" if ext else final_name
-                dest_path = raw_dir / final_name
-                shutil.move(str(tmp_path), dest_path)
-
-                mime_type = detect_mime(dest_path)
-                pages = count_pdf_pages(dest_path) if dest_path.suffix.lower() == ".pdf" else None
-
-                entry = {
-                    "id": doc_id,
-                    "title": item.title,
-                    "source_name": source.name,
-                    "source_url": result.final_url or item.url,
-                    "source_page": item.source_page or source.base_url,
-                    "release_date": item.release_date or "",
-                    "downloaded_at": utc_now_iso(),
-                    "sha256": sha,
-                    "file_path": str(dest_path),
-                    "mime_type": mime_type,
-                    "pages": pages,
-                    "tags": item.tags,
-                    "notes": item.notes or source.notes,
-                    "is_official": bool(source.is_official),
-                    "license_or_terms": "as published by source",
-                    "etag": result.etag,
-                    "last_modified": result.last_modified,
-                    "content_disposition": result.content_disposition,
-                    "sources": [
-                        {
-                            "source_name": source.name,
-                            "source_url": item.source_page or source.base_url,
-                        }
-                    ],
-                }
-
-                write_json(Path("data/meta") / f"{doc_id}.json", entry)
-                catalog.append(entry)
-                by_sha[sha] = entry
-                by_url[entry["source_url"]] = entry
-                updated = True
-                new_docs += 1
-                total_bytes += result.size
-                run_bytes_used += result.size
-                downloaded += 1
-                seen_urls.add(item.url)
-                state[source.id] = {
-                    "cursor": idx + 1,
-                    "seen_urls": sorted(seen_urls),
-                    "failed_urls": failed_urls,
-                    "last_run": utc_now_iso(),
-                }
-                state_changed = True
-
-        print(
-            f"[ingest] {source.id}: downloaded {downloaded} files, new {new_docs}, "
-            f"bytes {total_bytes}, attempts {attempted}, non-file {skipped_nonfile}"
-        )
-        current_cursor = state.get(source.id, {}).get("cursor", cursor)
-        state[source.id] = {
-            "cursor": current_cursor,
-            "seen_urls": sorted(seen_urls),
-            "failed_urls": failed_urls,
-            "last_run": utc_now_iso(),
-        }
-        state_changed = True
+            print(
+                f"[ingest] {source.id}: downloaded {downloaded} files, new {new_docs}, "
+                f"bytes {total_bytes}, attempts {attempted}, non-file {skipped_nonfile}"
+            )
+            state[source.id] = {
+                "cursor": next_cursor,
+                "seen_urls": sorted(seen_urls),
+                "failed_urls": failed_urls,
+                "last_run": utc_now_iso(),
+            }
+            state_changed = True
+    finally:
+        # Discoveries for sources the run never reached are not started
+        discovery_executor.shutdown(cancel_futures=True)
 
     if updated:
         catalog = sorted(catalog, key=lambda e: e.get("release_date") or "")
         save_catalog(catalog)
     if state_changed:
         save_state(state)
+    if request_context.head_cache != head_cache_before:
+        save_head_cache(request_context.head_cache)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
-from scripts.ingest import RateLimiter, request_with_retry
+import threading
+import time
+
+from scripts.ingest import BACKOFF_CAP_SECONDS, HostRateLimiter, RateLimiter, compute_backoff, request_with_retry
 
 
 class FakeResponse:
@@ -48,3 +51,88 @@ def test_retry_respects_retry_after(monkeypatch):
     assert resp.status_code == 200
     assert session.calls == 2
     assert sleeps and sleeps[0] >= 2
+
+
+def test_host_rate_limiter_is_per_host(monkeypatch):
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def fake_sleep(value):
+        sleeps.append(value)
+        clock["now"] += value
+
+    monkeypatch.setattr("time.monotonic", lambda: clock["now"])
+    monkeypatch.setattr("time.sleep", fake_sleep)
+
+    limiter = HostRateLimiter(2)
+    limiter.wait("https://a.example/one")
+    limiter.wait("https://b.example/one")
+    assert sleeps == []
+    limiter.wait("https://a.example/two")
+    assert sleeps == [0.5]
+    assert limiter.for_host("a.example") is limiter.for_host("a.example")
+
+
+def test_rate_limiter_reserves_slots_for_concurrent_waiters(monkeypatch):
+    limiter = RateLimiter(4)
+    sleeps = []
+    # Waiters that arrive together get consecutive slots, one interval apart
+    monkeypatch.setattr("time.monotonic", lambda: 50.0)
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    threads = [threading.Thread(target=limiter.wait) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(sleeps) == [0.25, 0.5, 0.75]
+
+
+def test_backoff_is_decorrelated_and_capped(monkeypatch):
+    monkeypatch.setattr("random.uniform", lambda low, high: high)
+    assert compute_backoff(1.0, 1.0, None) == 3.0
+    assert compute_backoff(1.0, 3.0, None) == 9.0
+    assert compute_backoff(1.0, 30.0, None) == BACKOFF_CAP_SECONDS
+    assert compute_backoff(1.0, 30.0, 120.0) == 120.0
+
+    monkeypatch.setattr("random.uniform", lambda low, high: low)
+    assert compute_backoff(1.0, 9.0, None) == 1.0
+    assert compute_backoff(1.0, 9.0, 2.5) == 2.5
+
+
+def test_host_rate_limiter_overrides_and_pauses(monkeypatch):
+    clock = {"now": 10.0}
+    sleeps = []
+
+    def fake_sleep(value):
+        sleeps.append(value)
+        clock["now"] += value
+
+    monkeypatch.setattr("time.monotonic", lambda: clock["now"])
+    monkeypatch.setattr("time.sleep", fake_sleep)
+
+    limiter = HostRateLimiter(1, {"fast.example": 4})
+    assert limiter.for_host("fast.example").interval == 0.25
+    assert limiter.for_host("slow.example").interval == 1.0
+
+    # A 429 seen by one request holds back the next request to that host only
+    limiter.pause("https://slow.example/a", 5.0)
+    limiter.wait("https://fast.example/a")
+    assert sleeps == []
+    limiter.wait("https://slow.example/b")
+    assert sleeps == [5.0]
+
+
+def test_429_pauses_the_host_for_other_requests(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda value: None)
+    limiter = HostRateLimiter(0)
+    session = FakeSession([FakeResponse(429, headers={"Retry-After": "30"}), FakeResponse(200)])
+    request_with_retry(
+        session,
+        "GET",
+        "https://example.test/file",
+        timeout=5,
+        retry_max=1,
+        backoff_base=0,
+        limiter=limiter,
+    )
+    assert limiter.for_host("example.test")._last >= time.monotonic() + 29
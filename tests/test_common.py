@@ -1,4 +1,9 @@
-from scripts.common import detect_mime, slugify
+import json
+
+import pytest
+
+from scripts import common
+from scripts.common import detect_mime, slugify, write_json
 
 
 def test_slugify():
@@ -11,3 +16,48 @@ def test_detect_mime_pdf():
         suffix = ".pdf"
 
     assert detect_mime(DummyPath()) == "application/pdf"
+
+
+def test_write_json_same_output_without_orjson(tmp_path, monkeypatch):
+    data = {"b": [1, 2.5, None], "a": {"name": "Press Release — Phase 1", "empty": []}}
+    write_json(tmp_path / "fast.json", data)
+    monkeypatch.setattr(common, "HAS_ORJSON", False)
+    write_json(tmp_path / "slow.json", data)
+
+    assert (tmp_path / "fast.json").read_bytes() == (tmp_path / "slow.json").read_bytes()
+    assert json.loads((tmp_path / "slow.json").read_text(encoding="utf-8")) == data
+
+
+def test_load_json_same_result_without_orjson(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text('{"title": "Press Release — Phase 1", "pages": [1, 2.5], "score": NaN}', encoding="utf-8")
+    fast = common.load_json(path, None)
+    monkeypatch.setattr(common, "HAS_ORJSON", False)
+    slow = common.load_json(path, None)
+
+    assert fast["title"] == slow["title"] == "Press Release — Phase 1"
+    assert fast["pages"] == slow["pages"] == [1, 2.5]
+    assert fast["score"] != fast["score"] and slow["score"] != slow["score"]
+    assert common.load_json(tmp_path / "missing.json", []) == []
+
+
+def test_write_json_replaces_file_atomically(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.json"
+    write_json(path, [{"id": "a"}])
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(common.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        write_json(path, [{"id": "b"}])
+    assert common.load_json(path, None) == [{"id": "a"}]
+    assert [p.name for p in tmp_path.iterdir()] == ["catalog.json"]
+
+
+def test_index_by_sha_matches_find_by_sha():
+    entries = [{"id": "a", "sha256": "x"}, {"id": "b"}, {"id": "c", "sha256": "x"}, {"id": "d", "sha256": "y"}]
+    index = common.index_by_sha(entries)
+    assert index == {"x": entries[0], "y": entries[3]}
+    for sha in ("x", "y", "z"):
+        assert index.get(sha) is common.find_by_sha(entries, sha)
@@ -0,0 +1,46 @@
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import NameObject, NumberObject
+
+from scripts import ingest
+from scripts.ingest import count_pdf_pages
+
+
+def _write_pdf(path, pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    with path.open("wb") as f:
+        writer.write(f)
+
+
+@pytest.mark.parametrize("has_pikepdf", [True, False])
+def test_count_pdf_pages(tmp_path, monkeypatch, has_pikepdf):
+    if has_pikepdf and not ingest.HAS_PIKEPDF:
+        pytest.skip("pikepdf not installed")
+    monkeypatch.setattr(ingest, "HAS_PIKEPDF", has_pikepdf)
+    path = tmp_path / "doc.pdf"
+    _write_pdf(path, 3)
+    assert count_pdf_pages(path) == 3
+
+
+@pytest.mark.parametrize("has_pikepdf", [True, False])
+def test_count_pdf_pages_unreadable(tmp_path, monkeypatch, has_pikepdf):
+    if has_pikepdf and not ingest.HAS_PIKEPDF:
+        pytest.skip("pikepdf not installed")
+    monkeypatch.setattr(ingest, "HAS_PIKEPDF", has_pikepdf)
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+    assert count_pdf_pages(path) is None
+
+
+def test_count_pdf_pages_walks_tree_without_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "HAS_PIKEPDF", False)
+    writer = PdfWriter()
+    for _ in range(2):
+        writer.add_blank_page(width=72, height=72)
+    writer.root_object["/Pages"][NameObject("/Count")] = NumberObject(0)
+    path = tmp_path / "doc.pdf"
+    with path.open("wb") as f:
+        writer.write(f)
+    assert count_pdf_pages(path) == 2
@@ -0,0 +1,299 @@
+import gzip
+import hashlib
+import io
+import json
+import time
+
+import pytest
+import requests
+import urllib3
+
+from scripts import ingest
+from scripts.common import sha256_file
+from scripts.ingest import RateLimiter, cached_head, conditional_headers, download_file
+
+
+class FakeStreamResponse:
+    url = "https://example.test/final.pdf"
+    headers = {"Content-Type": "application/pdf", "ETag": '"abc"'}
+
+    def __init__(self, chunks, status_code=200):
+        self.raw = io.BytesIO(b"".join(chunks))
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+        self.headers = None
+
+    def request(self, method, url, **kwargs):
+        self.headers = kwargs.get("headers")
+        return FakeStreamResponse(self.chunks, self.status_code)
+
+
+def test_download_file_hashes_while_streaming(tmp_path):
+    chunks = [b"%PDF-1.4\n", b"", b"x" * 5000, b"%%EOF\n"]
+    dest = tmp_path / "out" / "doc.pdf"
+    result = download_file(
+        FakeSession(chunks),
+        "https://example.test/doc.pdf",
+        dest,
+        5,
+        retry_max=0,
+        backoff_base=0,
+        limiter=RateLimiter(0),
+    )
+    assert dest.read_bytes() == b"".join(chunks)
+    assert result.size == len(b"".join(chunks))
+    assert result.sha256 == hashlib.sha256(b"".join(chunks)).hexdigest() == sha256_file(dest)
+    assert (result.final_url, result.etag) == ("https://example.test/final.pdf", '"abc"')
+    assert result.head == b"".join(chunks)[:200]
+
+
+def test_download_file_not_modified(tmp_path):
+    session = FakeSession([b"unexpected"], status_code=304)
+    dest = tmp_path / "doc.pdf"
+    result = download_file(
+        session,
+        "https://example.test/doc.pdf",
+        dest,
+        5,
+        headers=conditional_headers({"Referer": "https://example.test"}, etag='"abc"'),
+        retry_max=0,
+        backoff_base=0,
+        limiter=RateLimiter(0),
+    )
+    assert result.not_modified
+    assert (result.size, result.sha256) == (0, "")
+    assert not dest.exists()
+    assert session.headers == {"Referer": "https://example.test", "If-None-Match": '"abc"'}
+
+
+def test_conditional_headers():
+    headers = {"Referer": "https://example.test"}
+    assert conditional_headers(headers) == headers
+    assert conditional_headers(headers, last_modified="Tue, 01 Jan 2026 00:00:00 GMT") == {
+        "Referer": "https://example.test",
+        "If-Modified-Since": "Tue, 01 Jan 2026 00:00:00 GMT",
+    }
+    assert "If-None-Match" not in headers
+
+
+class FakeHeadResponse:
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+        self.drained = False
+        self.closed = False
+
+    @property
+    def content(self):
+        self.drained = True
+        return b""
+
+    def close(self):
+        self.closed = True
+
+
+class FakeHeadSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append((method, kwargs.get("headers")))
+        assert kwargs.get("stream") == (method == "GET")
+        return self.responses.pop(0)
+
+
+def head_sender(session, url):
+    return lambda method, headers: session.request(method, url, headers=headers, stream=method == "GET")
+
+
+def test_cached_head_reuses_and_revalidates(monkeypatch):
+    session = FakeHeadSession(
+        [
+            FakeHeadResponse(200, {"Content-Length": "1234", "ETag": '"v1"', "Content-Type": "application/pdf"}),
+            FakeHeadResponse(304, {}),
+        ]
+    )
+    head_cache = {}
+    url = "https://example.test/doc.pdf"
+    send = head_sender(session, url)
+
+    assert cached_head(head_cache, url, {}, send)["content_length"] == 1234
+    assert head_cache[url]["etag"] == '"v1"'
+    # Fresh entries are answered from the cache
+    assert cached_head(head_cache, url, {}, send)["content_length"] == 1234
+    assert len(session.sent) == 1
+
+    # Expired entries are revalidated; a 304 keeps the cached fields
+    monkeypatch.setattr(ingest, "HEAD_CACHE_TTL_SECONDS", 0)
+    assert cached_head(head_cache, url, {}, send)["content_type"] == "application/pdf"
+    assert session.sent[1] == ("HEAD", {"If-None-Match": '"v1"'})
+
+
+def test_cached_head_does_not_cache_errors():
+    url = "https://example.test/missing.pdf"
+    session = FakeHeadSession([FakeHeadResponse(404, {"Content-Length": "10"})])
+    head_cache = {}
+    assert cached_head(head_cache, url, None, head_sender(session, url)) is None
+    assert head_cache == {}
+
+
+def test_download_file_decodes_gzip_raw_stream(tmp_path, monkeypatch):
+    body = b"%PDF-1.4\n" + b"y" * 10000 + b"%%EOF\n"
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = "https://example.test/doc.pdf"
+    resp.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(gzip.compress(body)),
+        headers={"Content-Encoding": "gzip"},
+        preload_content=False,
+    )
+
+    class RawSession:
+        def request(self, method, url, **kwargs):
+            return resp
+
+    monkeypatch.setattr(ingest, "DOWNLOAD_BUFFER_SIZE", 1024)
+    dest = tmp_path / "doc.pdf"
+    result = download_file(
+        RawSession(),
+        "https://example.test/doc.pdf",
+        dest,
+        5,
+        retry_max=0,
+        backoff_base=0,
+        limiter=RateLimiter(0),
+    )
+    assert dest.read_bytes() == body
+    assert (result.size, result.sha256) == (len(body), hashlib.sha256(body).hexdigest())
+
+
+def test_download_file_leaves_nothing_behind_on_failure(tmp_path):
+    class BrokenRaw(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell():
+                raise requests.ConnectionError("connection reset")
+            return super().read(4)
+
+    session = FakeSession([b"%PDF-1.4\n"])
+    dest = tmp_path / "doc.pdf"
+    dest.write_bytes(b"previous")
+    response = FakeStreamResponse([])
+    response.raw = BrokenRaw(b"%PDF-1.4\n")
+    session.request = lambda method, url, **kwargs: response
+    with pytest.raises(requests.ConnectionError):
+        download_file(
+            session,
+            "https://example.test/doc.pdf",
+            dest,
+            5,
+            retry_max=0,
+            backoff_base=0,
+            limiter=RateLimiter(0),
+        )
+    assert dest.read_bytes() == b"previous"
+    assert sorted(tmp_path.iterdir()) == [dest]
+
+
+def test_cached_head_falls_back_to_ranged_get():
+    url = "https://example.test/doc.pdf"
+    ranged = FakeHeadResponse(
+        206, {"Content-Range": "bytes 0-0/5000", "Content-Length": "1", "Content-Type": "application/pdf"}
+    )
+    session = FakeHeadSession([FakeHeadResponse(405, {}), ranged])
+    entry = cached_head(None, url, {"Referer": "https://example.test"}, head_sender(session, url))
+    assert (entry["content_type"], entry["content_length"]) == ("application/pdf", 5000)
+    assert session.sent[1] == ("GET", {"Referer": "https://example.test", "Range": "bytes=0-0"})
+    # The one-byte body is read so the connection can be reused
+    assert ranged.drained and ranged.closed
+
+
+def test_blocked_html_body_is_sniffed_from_download_head(tmp_path):
+    result = ingest.DownloadResult(
+        size=120,
+        content_type="application/octet-stream",
+        content_disposition="",
+        final_url="https://example.test/doc.pdf",
+        etag="",
+        last_modified="",
+        head=b"\n  <!DOCTYPE html><html><body>Age verification</body></html>",
+    )
+    # The head is enough; the file itself is not opened
+    blocked = ingest.is_blocked_response(result, tmp_path / "missing.pdf")
+    assert blocked is not None and blocked.reason == "html_body"
+
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+    assert not ingest.is_html_file(pdf, "application/pdf")
+
+
+def test_download_file_stops_past_max_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "DOWNLOAD_BUFFER_SIZE", 1024)
+    dest = tmp_path / "doc.pdf"
+    with pytest.raises(ingest.DownloadTooLarge) as excinfo:
+        download_file(
+            FakeSession([b"x" * 5000]),
+            "https://example.test/doc.pdf",
+            dest,
+            5,
+            retry_max=0,
+            backoff_base=0,
+            limiter=RateLimiter(0),
+            max_size=2048,
+        )
+    # Aborted at the first block past the cap, not after the whole body
+    assert excinfo.value.size == 3072
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_file_rejects_oversized_content_length_unread(tmp_path):
+    session = FakeSession([b"x" * 5000])
+    response = FakeStreamResponse(session.chunks)
+    response.headers = {"Content-Type": "application/pdf", "Content-Length": "5000"}
+    session.request = lambda method, url, **kwargs: response
+    with pytest.raises(ingest.DownloadTooLarge) as excinfo:
+        download_file(
+            session,
+            "https://example.test/doc.pdf",
+            tmp_path / "doc.pdf",
+            5,
+            retry_max=0,
+            backoff_base=0,
+            limiter=RateLimiter(0),
+            max_size=2048,
+        )
+    assert excinfo.value.size == 5000
+    assert response.raw.tell() == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_load_head_cache_prunes_by_age(tmp_path, monkeypatch):
+    now = time.time()
+    path = tmp_path / "head_cache.json"
+    path.write_text(
+        json.dumps(
+            {
+                "fresh": {"fetched_at": now},
+                "expired-with-etag": {"etag": '"v1"', "fetched_at": now - 2 * ingest.HEAD_CACHE_TTL_SECONDS},
+                "expired-without-validators": {"fetched_at": now - 2 * ingest.HEAD_CACHE_TTL_SECONDS},
+                "too-old-with-etag": {"etag": '"v1"', "fetched_at": now - 2 * ingest.HEAD_CACHE_MAX_AGE_SECONDS},
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(ingest, "HEAD_CACHE_PATH", path)
+    assert sorted(ingest.load_head_cache()) == ["expired-with-etag", "fresh"]
@@ -0,0 +1,85 @@
+import pytest
+
+from scripts import enhanced_ocr
+from scripts.enhanced_ocr import parse_tesseract_tsv, preprocess_image
+
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+
+def _word(page, block, par, line, word, conf, text):
+    return f"5\t{page}\t{block}\t{par}\t{line}\t{word}\t0\t0\t10\t10\t{conf}\t{text}"
+
+
+@pytest.mark.parametrize("strategy", ["default", "high_contrast", "denoise"])
+def test_array_preprocess_matches_pil(monkeypatch, strategy):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 256, (120, 80), dtype=np.uint8))
+
+    fast = np.asarray(preprocess_image(image.convert("RGB"), strategy), dtype=int)
+    monkeypatch.setattr(enhanced_ocr, "HAS_CV2", False)
+    reference = np.asarray(preprocess_image(image, strategy), dtype=int)
+
+    assert fast.shape == reference.shape
+    # PIL leaves the 1px border unfiltered; interior differs only by rounding.
+    assert np.abs(fast - reference)[1:-1, 1:-1].max() <= 2
+
+
+def test_parse_tesseract_tsv_splits_pages():
+    tsv = "\n".join(
+        [
+            TSV_HEADER,
+            "1\t1\t0\t0\t0\t0\t0\t0\t100\t100\t-1\t",
+            _word(1, 1, 1, 1, 1, 90, "From:"),
+            _word(1, 1, 1, 1, 2, 80, "Jeffrey"),
+            _word(1, 1, 1, 2, 1, 70, "Subject:"),
+            _word(1, 2, 1, 1, 1, 60, "Body"),
+            "1\t2\t0\t0\t0\t0\t0\t0\t100\t100\t-1\t",
+            _word(2, 1, 1, 1, 1, 50, "Page"),
+            _word(2, 1, 1, 1, 2, -1, " "),
+        ]
+    )
+    pages = parse_tesseract_tsv(tsv, 3)
+    assert pages[0] == ("From: Jeffrey\nSubject:\n\nBody", 75.0, 0)
+    assert pages[1] == ("Page", 50.0, 0)
+    assert pages[2] == ("", 0.0, 0)
+
+
+def test_parse_tesseract_tsv_drops_low_confidence_tokens():
+    tsv = "\n".join(
+        [
+            TSV_HEADER,
+            _word(1, 1, 1, 1, 1, 91, "Flight"),
+            _word(1, 1, 1, 1, 2, 12, "~}|"),
+            _word(1, 1, 1, 1, 3, 88, "log"),
+            _word(1, 1, 1, 2, 1, 30, "::;"),
+        ]
+    )
+    text, confidence, dropped = parse_tesseract_tsv(tsv, 1, min_conf=50)[0]
+    assert text == "Flight log"
+    assert dropped == 2
+    # Confidence still reflects the whole page, not just the kept tokens.
+    assert confidence == pytest.approx((91 + 12 + 88 + 30) / 4)
+
+
+def test_iter_page_chunks_renders_bounded_ranges(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(enhanced_ocr, "pdfinfo_from_path", lambda path: {"Pages": 23})
+
+    def fake_convert(path, first_page, last_page, dpi):
+        calls.append((first_page, last_page))
+        return list(range(first_page, last_page + 1))
+
+    monkeypatch.setattr(enhanced_ocr, "convert_from_path", fake_convert)
+
+    chunks = list(enhanced_ocr.iter_page_chunks(tmp_path / "doc.pdf", dpi=200))
+    assert calls == [(1, 10), (11, 20), (21, 23)]
+    assert sum(len(chunk) for chunk in chunks) == 23
+
+    calls.clear()
+    list(enhanced_ocr.iter_page_chunks(tmp_path / "doc.pdf", dpi=200, max_pages=5))
+    assert calls == [(1, 5)]
@@ -0,0 +1,50 @@
+from scripts import extract_relationships
+from scripts.extract_relationships import (
+    build_relationship_graph,
+    count_co_mentions,
+    extract_email_relationships,
+)
+
+
+CATALOG = [
+    {"person_names": ["Alice Smith", "Bob Jones", "Carol White"]},
+    {"person_names": ["Bob Jones", "Alice Smith"]},
+    {"person_names": ["Dave Brown"]},
+    {"person_names": []},
+]
+
+
+def test_count_co_mentions():
+    counts = count_co_mentions(CATALOG)
+    assert counts == {
+        ("Alice Smith", "Bob Jones"): 2,
+        ("Alice Smith", "Carol White"): 1,
+        ("Bob Jones", "Carol White"): 1,
+    }
+
+
+def test_count_co_mentions_without_scipy(monkeypatch):
+    monkeypatch.setattr(extract_relationships, "HAS_SCIPY", False)
+    assert count_co_mentions(CATALOG) == {
+        ("Alice Smith", "Bob Jones"): 2,
+        ("Alice Smith", "Carol White"): 1,
+        ("Bob Jones", "Carol White"): 1,
+    }
+
+
+def test_graph_co_mention_edges_are_bidirectional():
+    graph = build_relationship_graph(CATALOG)
+    edges = {(e["source"], e["target"]): e["weight"] for e in graph["edges"]}
+    assert edges[("Alice Smith", "Bob Jones")] == 2
+    assert edges[("Bob Jones", "Alice Smith")] == 2
+    assert "Dave Brown" not in {n["id"] for n in graph["nodes"]}
+
+
+def test_email_relationships_skip_placeholders():
+    catalog = [
+        {"document_category": "email", "email_from": "Jeffrey", "email_to": "Ghislaine"},
+        {"document_category": "email", "email_from": "[Not visible in document]", "email_to": "Ghislaine"},
+        {"document_category": "correspondence", "email_from": "Jeffrey", "email_to": None},
+        {"document_category": "deposition", "email_from": "Jeffrey", "email_to": "Ghislaine"},
+    ]
+    assert extract_email_relationships(catalog) == [("Jeffrey", "Ghislaine", "email")]
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 
 from scripts.extract import extract_all
@@ -45,3 +46,129 @@ def test_extract_builds_shards(tmp_path, monkeypatch):
     assert shard_path.exists()
     shard_docs = json.loads(shard_path.read_text(encoding="utf-8"))
     assert shard_docs[0]["content"].startswith("test content")
+
+
+def test_extract_parallel_preserves_catalog_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("EPPIE_EXTRACT_WORKERS", "2")
+    (tmp_path / "data/meta").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "data/raw").mkdir(parents=True, exist_ok=True)
+
+    catalog = []
+    for i, (source, year) in enumerate([("Source A", "2025"), ("Source B", "2026"), ("Source A", "2025")]):
+        raw_path = tmp_path / f"data/raw/doc{i}.txt"
+        raw_path.write_text(f"content {i}", encoding="utf-8")
+        catalog.append(
+            {
+                "id": f"doc{i}",
+                "title": f"Doc {i}",
+                "source_name": source,
+                "release_date": f"{year}-01-01",
+                "file_path": str(raw_path),
+                "mime_type": "text/plain",
+            }
+        )
+    (tmp_path / "data/meta/catalog.json").write_text(json.dumps(catalog), encoding="utf-8")
+
+    extract_all()
+
+    manifest = json.loads((tmp_path / "data/derived/index/manifest.json").read_text(encoding="utf-8"))
+    assert manifest["total_docs"] == 3
+    shard_a = json.loads(Path("data/derived/index/shards/source-a/2025.json").read_text(encoding="utf-8"))
+    assert [doc["id"] for doc in shard_a] == ["doc0", "doc2"]
+    assert shard_a[1]["content"] == "content 2"
+
+
+def test_extract_skips_unchanged_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("EPPIE_EXTRACT_WORKERS", "1")
+    (tmp_path / "data/meta").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "data/raw").mkdir(parents=True, exist_ok=True)
+
+    raw_path = tmp_path / "data/raw/doc1.txt"
+    raw_path.write_text("original content", encoding="utf-8")
+    catalog = [
+        {
+            "id": "doc1",
+            "title": "Test Doc",
+            "source_name": "Unit Test",
+            "release_date": "2026-01-01",
+            "file_path": str(raw_path),
+            "mime_type": "text/plain",
+        }
+    ]
+    catalog_path = tmp_path / "data/meta/catalog.json"
+    catalog_path.write_text(json.dumps(catalog), encoding="utf-8")
+    extract_all()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged entry was reprocessed")
+
+    # Metadata edits are still picked up without reprocessing the document.
+    catalog[0]["title"] = "Renamed Doc"
+    catalog_path.write_text(json.dumps(catalog), encoding="utf-8")
+    with monkeypatch.context() as m:
+        m.setattr("scripts.extract._process_entry", fail)
+        extract_all()
+
+    shard_path = Path("data/derived/index/shards/unit-test/2026.json")
+    shard_docs = json.loads(shard_path.read_text(encoding="utf-8"))
+    assert shard_docs[0]["title"] == "Renamed Doc"
+    assert shard_docs[0]["content"] == "original content"
+
+    raw_path.write_text("updated content", encoding="utf-8")
+    os.utime(raw_path, (shard_docs[0]["mtime"] + 10, shard_docs[0]["mtime"] + 10))
+    extract_all()
+    shard_docs = json.loads(shard_path.read_text(encoding="utf-8"))
+    assert shard_docs[0]["content"] == "updated content"
+
+
+def test_extract_reprocesses_entries_recategorized_as_email(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("EPPIE_EXTRACT_WORKERS", "1")
+    (tmp_path / "data/meta").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "data/raw").mkdir(parents=True, exist_ok=True)
+    text_dir = tmp_path / "data/derived/text"
+    text_dir.mkdir(parents=True, exist_ok=True)
+
+    raw_path = tmp_path / "data/raw/doc1.pdf"
+    raw_path.write_bytes(b"%PDF-1.4")
+    (text_dir / "doc1.txt").write_text(
+        "From: Jeffrey Epstein <jeevacation@gmail.com>\n"
+        "To: Ghislaine Maxwell <gmax@example.com>\n"
+        "Subject: Dinner plans\n\nBody text.\n",
+        encoding="utf-8",
+    )
+    # Already analyzed, so only the email step is left to run
+    entry = {
+        "id": "doc1",
+        "title": "Test Doc",
+        "source_name": "Unit Test",
+        "release_date": "2026-01-01",
+        "file_path": str(raw_path),
+        "mime_type": "application/pdf",
+        "pdf_type": "text",
+        "has_extractable_text": True,
+        "ocr_applied": False,
+        "text_quality_score": 1.0,
+        "file_size_bytes": 8,
+        "extracted_file_numbers": [],
+        "extracted_dates": [],
+        "document_category": "legal",
+        "person_names": [],
+        "locations": [],
+        "case_numbers": [],
+    }
+    catalog_path = tmp_path / "data/meta/catalog.json"
+    catalog_path.write_text(json.dumps([entry]), encoding="utf-8")
+    extract_all()
+    assert "email_from" not in json.loads(catalog_path.read_text(encoding="utf-8"))[0]
+
+    # Recategorized by a later pass; no file changed
+    entry["document_category"] = "email"
+    catalog_path.write_text(json.dumps([entry]), encoding="utf-8")
+    extract_all()
+
+    updated = json.loads(catalog_path.read_text(encoding="utf-8"))[0]
+    assert updated["email_from"] == "Jeffrey Epstein <jeevacation@gmail.com>"
+    assert updated["email_subject"] == "Dinner plans"
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Tests for the email metadata cleanup scripts."""
+from __future__ import annotations
+
+from scripts import email_cleaners, fix_email_metadata_complete
+from scripts.common import load_catalog, save_catalog
+from scripts.email_cleaners import clean_email_field, clean_email_field_aggressive
+from scripts.fix_email_metadata import extract_name_from_email
+from scripts.fix_email_metadata_complete import extract_email_metadata_from_text
+
+
+class TestHeaderExtraction:
+    """Test header re-extraction from document text."""
+
+    def test_standard_headers(self):
+        text = "From: Jeffrey E. <jeevacation@gmail.com>\nSent: Monday\nTo: Ghislaine\nCc: Lesley\nSubject: RE: schedule\n\nBody"
+        assert extract_email_metadata_from_text(text) == {
+            "from": "Jeffrey E. <jeevacation@gmail.com>",
+            "to": "Ghislaine",
+            "subject": "RE: schedule",
+            "cc": "Lesley",
+        }
+
+    def test_labels_are_case_insensitive(self):
+        text = "FROM: A Person\nTO: Another Person\nSUBJECT: Hello"
+        assert extract_email_metadata_from_text(text) == {
+            "from": "A Person",
+            "to": "Another Person",
+            "subject": "Hello",
+        }
+
+    def test_primary_label_wins_over_alias(self):
+        text = "Sender: Fallback Sender\nFrom: Real Sender\nRe: Fallback\nSubject: Real Subject"
+        metadata = extract_email_metadata_from_text(text)
+        assert metadata["from"] == "Real Sender"
+        assert metadata["subject"] == "Real Subject"
+
+    def test_empty_header_does_not_capture_next_line(self):
+        text = "From: Someone\nCc:\nSubject: Hello"
+        assert "cc" not in extract_email_metadata_from_text(text)
+
+    def test_labels_inside_lines_are_ignored(self):
+        text = "Reply [mailto:someone@example.com] for details"
+        assert extract_email_metadata_from_text(text) == {}
+
+    def test_only_header_block_is_scanned(self):
+        text = "x" * 2000 + "\nFrom: Too Late"
+        assert extract_email_metadata_from_text(text) == {}
+
+
+class TestFieldCleaning:
+    """Test From/To field cleaners."""
+
+    def test_plain_name_untouched(self):
+        assert clean_email_field("Jane Smith") == "Jane Smith"
+        assert clean_email_field_aggressive("Jane Smith") == "Jane Smith"
+
+    def test_sent_date_removed(self):
+        assert clean_email_field("Sent: Jan 10, 2018 4:37 PM") == ""
+        assert clean_email_field_aggressive("Sent: cipher 10, 2018 4:37 PM") == ""
+
+    def test_cipher_case_insensitive(self):
+        assert clean_email_field("Jane CIPHER 10 Smith") == "Jane Smith"
+        assert clean_email_field_aggressive("Jane Cipher 10 Smith") == "Jane Smith"
+
+    def test_slash_date_removed(self):
+        assert clean_email_field("Jane Smith 1/2/2019 4:37 PM") == "Jane Smith"
+        assert clean_email_field_aggressive("Jane Smith 1/2/2019") == "Jane Smith"
+
+
+class TestAlreadyCleanShortcut:
+    """Fields passing _is_already_clean must be left unchanged by the full cleaner."""
+
+    SAMPLES = [
+        "Jane Smith", "N/A", "ab", "x", "", "  Jane Smith", "Jane\tSmith", ", Jane",
+        "((", "(USMS)'", "Sent: Jane", "Jane 10", "x" * 150, "x" * 151, "x" * 201,
+        "[Not visible in document]",
+    ]
+
+    def test_shortcut_is_safe(self):
+        pairs = [
+            (email_cleaners.is_clean_email_field, email_cleaners.clean_email_field),
+            (email_cleaners.is_clean_email_field_aggressive, email_cleaners.clean_email_field_aggressive),
+            (email_cleaners.is_clean_field, email_cleaners.clean_field),
+        ]
+        for is_clean, clean in pairs:
+            for value in self.SAMPLES:
+                if is_clean(value):
+                    assert clean(value) == value
+
+    def test_plain_name_takes_shortcut(self):
+        assert email_cleaners.is_clean_email_field("Jane Smith")
+        assert email_cleaners.is_clean_email_field_aggressive("Jane Smith")
+        assert email_cleaners.is_clean_field("Jane Smith")
+
+
+class TestNameFromEmail:
+    """Test extract_name_from_email."""
+
+    def test_name_with_address(self):
+        assert extract_name_from_email("John Doe <john@example.com>") == "John Doe"
+
+    def test_mailto(self):
+        assert extract_name_from_email("a@b.com [mailto:a@b.com]") == "a@b.com"
+
+    def test_plain(self):
+        assert extract_name_from_email("  Rodeb Teresa ") == "Rodeb Teresa"
+
+    def test_address_must_end_string(self):
+        assert extract_name_from_email("John <j@x.com> [mailto:j@x.com]") == "John <j@x.com>"
+
+
+class TestCompleteFixMain:
+    """End-to-end run of fix_email_metadata_complete.main on a tiny catalog."""
+
+    def test_reextracts_and_cleans(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text_dir = tmp_path / "data" / "derived" / "text"
+        text_dir.mkdir(parents=True)
+        (text_dir / "a.txt").write_bytes(b"From: Jane   Smith\r\nTo: Bob Jones\r\nSubject: Flight plans\r\n\r\nBody")
+        save_catalog([
+            {"id": "a", "document_category": "email", "email_from": "", "email_cc": "  Carol  Diaz "},
+            {"id": "b", "document_category": "email", "email_from": "x", "email_to": "Ann Lee"},
+            {"id": "c", "document_category": "report"},
+        ])
+
+        fix_email_metadata_complete.main()
+
+        a, b, c = load_catalog()
+        assert (a["email_from"], a["email_to"], a["email_subject"], a["email_cc"]) == (
+            "Jane Smith", "Bob Jones", "Flight plans", "Carol Diaz",
+        )
+        assert (b["email_from"], b["email_to"]) == (email_cleaners.NOT_VISIBLE, "Ann Lee")
+        assert c == {"id": "c", "document_category": "report"}
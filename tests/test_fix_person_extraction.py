@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the person name re-extraction script."""
+from __future__ import annotations
+
+import pytest
+
+from scripts.fix_person_extraction import (
+    CONTEXT_NAME_RE,
+    SUFFIX_NAME_RE,
+    TITLE_NAME_RE,
+    extract_person_names_improved,
+    is_likely_person_name,
+)
+
+
+class TestNamePatterns:
+    """Test the candidate patterns feeding is_likely_person_name."""
+
+    def test_title_pattern(self):
+        text = "Met with Mrs. Jane Smith and Miss. Anna Lee Brown, then Dr. Oscar Vance."
+        assert [m.group(1) for m in TITLE_NAME_RE.finditer(text)] == [
+            "Jane Smith",
+            "Anna Lee Brown",
+            "Oscar Vance",
+        ]
+
+    def test_title_requires_period(self):
+        assert TITLE_NAME_RE.search("Mr Jane Smith") is None
+
+    def test_suffix_pattern(self):
+        match = SUFFIX_NAME_RE.search("signed by Robert Allen Brown III yesterday")
+        assert match.group(1) == "Robert Allen Brown"
+
+    def test_context_pattern(self):
+        match = CONTEXT_NAME_RE.search("Later Nadia Taylor testified that")
+        assert match.group(1) == "Later Nadia Taylor"
+
+
+class TestHighProfileNames:
+    """Test canonical high-profile name matching."""
+
+    def test_case_insensitive_match_returns_canonical_name(self):
+        names = extract_person_names_improved("notes: GHISLAINE MAXWELL and prince andrew")
+        assert "Ghislaine Maxwell" in names
+        assert "Prince Andrew" in names
+
+    def test_absent_names_not_returned(self):
+        assert "Bill Clinton" not in extract_person_names_improved("No names here.")
+
+
+class TestNameValidation:
+    """Test rejection rules in is_likely_person_name."""
+
+    def test_rejects_ocr_artifacts(self):
+        for candidate in ("Jane Sm1th", "Jane_Smith Doe", "Jane Smith-Doe", "J.Smith Doe", "jane@x Doe"):
+            assert not is_likely_person_name(candidate)
+
+    def test_rejects_newlines_and_double_spaces(self):
+        assert not is_likely_person_name("Jane\nSmith")
+        assert not is_likely_person_name("Jane  Smith")
+
+    def test_rejects_single_word(self):
+        assert not is_likely_person_name("Smith")
+
+
+class TestHighProfileOverlaps:
+    """Test names that overlap or contain each other."""
+
+    def test_contained_name_is_also_reported(self):
+        names = extract_person_names_improved("photo of Jean-Luc Brunel")
+        assert "Jean-Luc Brunel" in names
+        assert "Brunel" in names
+
+    def test_partially_overlapping_names(self):
+        names = extract_person_names_improved("Prince Andrew Albert Christian Edward")
+        assert "Prince Andrew" in names
+        assert "Andrew Albert Christian Edward" in names
+
+
+def test_re2_scan_matches_re(monkeypatch):
+    pytest.importorskip("re2")
+    from scripts import fix_person_extraction
+
+    text = (
+        "Dr. Alice Walker Jones said that Robert Allen Brown III and Mrs. Jane Smith\x0bLee"
+        " met.\nLater Nadia Taylor testified; Carl Evans Jr. wrote back."
+    )
+    compiled = (TITLE_NAME_RE, SUFFIX_NAME_RE, CONTEXT_NAME_RE)
+    for pattern, fast in zip(compiled, fix_person_extraction._RE2_NAME_PATTERNS):
+        assert [m.group(1) for m in fast.finditer(text)] == [m.group(1) for m in pattern.finditer(text)]
+
+    with_re2 = extract_person_names_improved(text)
+    monkeypatch.setattr(fix_person_extraction, "HAS_RE2", False)
+    assert extract_person_names_improved(text) == with_re2
+
+
+def test_main_updates_documents_with_text(tmp_path, monkeypatch):
+    from scripts import fix_person_extraction
+    from scripts.common import load_catalog, save_catalog
+
+    monkeypatch.chdir(tmp_path)
+    text_dir = tmp_path / "data" / "derived" / "text"
+    text_dir.mkdir(parents=True)
+    (text_dir / "a.txt").write_text("Ghislaine Maxwell met Bill Clinton", encoding="utf-8")
+    (text_dir / "b.txt").write_text("nothing to see", encoding="utf-8")
+    (text_dir / "notes.md").write_text("Prince Andrew", encoding="utf-8")
+    save_catalog([{"id": "a"}, {"id": "b"}, {"id": "c"}, {"id": "notes"}])
+
+    assert fix_person_extraction._text_doc_ids() == {"a", "b"}
+    fix_person_extraction.main()
+
+    assert load_catalog() == [
+        {"id": "a", "person_names": ["Bill Clinton", "Ghislaine Maxwell"]},
+        {"id": "b"},
+        {"id": "c"},
+        {"id": "notes"},
+    ]
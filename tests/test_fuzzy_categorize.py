@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for fuzzy categorization of OCR text."""
+from __future__ import annotations
+
+import pytest
+
+from scripts import fuzzy_categorize
+from scripts.common import load_catalog, save_catalog
+from scripts.fuzzy_categorize import find_fuzzy_keywords, fuzzy_categorize as categorize
+
+
+FLIGHT_TEXT = "Passenger manifest: departnre 10:00, arrlval 14:00, pilot on board, aircraft N908JE tail number"
+
+
+class TestFuzzyKeywords:
+    """Test keyword counting."""
+
+    def test_counts_ocr_garbled_keywords(self):
+        keywords = fuzzy_categorize.FUZZY_KEYWORDS["flight-log"]
+        # departure, arrival, pilot, aircraft, passenger, manifest, tail number
+        assert find_fuzzy_keywords(FLIGHT_TEXT, keywords, threshold=0.70) == 7
+
+    def test_short_words_must_match_exactly(self):
+        assert find_fuzzy_keywords("to me", ["to:", "tom"], threshold=0.5) == 0
+
+    def test_phrase_needs_exact_substring(self):
+        assert find_fuzzy_keywords("The Tail Number was", ["tail number"]) == 1
+        assert find_fuzzy_keywords("tail numbr", ["tail number"]) == 0
+
+    def test_difflib_fallback_agrees(self, monkeypatch):
+        keywords = fuzzy_categorize.FUZZY_KEYWORDS["flight-log"]
+        fast = find_fuzzy_keywords(FLIGHT_TEXT, keywords, threshold=0.70)
+        monkeypatch.setattr(fuzzy_categorize, "HAS_RAPIDFUZZ", False)
+        assert find_fuzzy_keywords(FLIGHT_TEXT, keywords, threshold=0.70) == fast
+
+    def test_extract_one_path_agrees(self, monkeypatch):
+        if not fuzzy_categorize.HAS_RAPIDFUZZ:
+            pytest.skip("rapidfuzz not installed")
+        keywords = fuzzy_categorize.FUZZY_KEYWORDS["flight-log"]
+        fast = find_fuzzy_keywords(FLIGHT_TEXT, keywords, threshold=0.70)
+        monkeypatch.setattr(fuzzy_categorize, "HAS_NUMPY", False)
+        assert find_fuzzy_keywords(FLIGHT_TEXT, keywords, threshold=0.70) == fast
+
+
+class TestFuzzyCategorize:
+    """Test category selection."""
+
+    def test_picks_best_category(self):
+        category, confidence = categorize(FLIGHT_TEXT, threshold=0.70)
+        assert category == "flight-log"
+        assert 0 < confidence <= 1
+
+    def test_needs_two_matches(self):
+        assert categorize("pilot", threshold=0.70) == (None, 0.0)
+
+
+class TestMain:
+    """End-to-end run of fuzzy_categorize.main on a tiny catalog."""
+
+    def test_categorizes_uncategorized_ocr_docs(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text_dir = tmp_path / "data" / "derived" / "text"
+        text_dir.mkdir(parents=True)
+        (text_dir / "a.txt").write_text(FLIGHT_TEXT)
+        (text_dir / "b.txt").write_text("nothing useful here")
+        ocr = {"ocr_applied": True, "text_quality_score": 50}
+        catalog = [
+            {"id": "a", **ocr},
+            {"id": "b", **ocr},
+            {"id": "missing", **ocr},
+            {"id": "done", "document_category": "report", **ocr},
+        ]
+        save_catalog(catalog)
+
+        fuzzy_categorize.main()
+
+        a, b, missing, done = load_catalog()
+        assert (a["document_category"], a["category_method"]) == ("flight-log", "fuzzy")
+        assert "document_category" not in b
+        assert "document_category" not in missing
+        assert done == catalog[3]
+
+    def test_rerun_reuses_cached_results(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text_dir = tmp_path / "data" / "derived" / "text"
+        text_dir.mkdir(parents=True)
+        (text_dir / "a.txt").write_text(FLIGHT_TEXT)
+        (text_dir / "b.txt").write_text(FLIGHT_TEXT)
+        ocr = {"ocr_applied": True, "text_quality_score": 50}
+        save_catalog([{"id": "a", **ocr}])
+        fuzzy_categorize.main()
+        results, texts = fuzzy_categorize.load_fuzzy_cache()
+        assert list(results.values()) == [["flight-log", 1.0]]
+        assert list(texts) == ["a"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cached text was scored again")
+
+        # Same text under another id is a cache hit; nothing reaches the pool
+        monkeypatch.setattr(fuzzy_categorize, "categorize_one", fail)
+        save_catalog([{"id": "b", **ocr}])
+        fuzzy_categorize.main()
+        assert load_catalog()[0]["document_category"] == "flight-log"
+
+    def test_cache_dropped_when_keywords_change(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fuzzy_categorize.save_fuzzy_cache({"abc": ["report", 1.0]}, {"a": [3, 1, "abc"]})
+        assert fuzzy_categorize.load_fuzzy_cache() == ({"abc": ["report", 1.0]}, {"a": [3, 1, "abc"]})
+        monkeypatch.setattr(fuzzy_categorize, "OCR_THRESHOLD", 0.9)
+        assert fuzzy_categorize.load_fuzzy_cache() == ({}, {})
+
+    def test_rerun_skips_reading_unchanged_texts(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text_dir = tmp_path / "data" / "derived" / "text"
+        text_dir.mkdir(parents=True)
+        (text_dir / "a.txt").write_text("nothing useful here")
+        save_catalog([{"id": "a", "ocr_applied": True, "text_quality_score": 50}])
+        fuzzy_categorize.main()
+
+        hashed = []
+        monkeypatch.setattr(fuzzy_categorize, "sha256_file", lambda path: hashed.append(path) or "changed")
+        fuzzy_categorize.main()
+        assert hashed == []
+
+        # A rewritten text is hashed (and so rescored) again
+        (text_dir / "a.txt").write_text("different text, different size")
+        monkeypatch.setattr(fuzzy_categorize, "categorize_one", lambda doc_id: (doc_id, None, 0.0))
+        fuzzy_categorize.main()
+        assert len(hashed) == 1
@@ -1,4 +1,6 @@
-from scripts.ingest import SourceConfig, resolve_source_base_url
+import threading
+
+from scripts.ingest import NOT_FOUND_SCAN_MAX_BYTES, SourceConfig, resolve_source_base_url, response_is_not_found
 
 
 class DummyResponse:
@@ -38,3 +40,41 @@ def test_resolve_source_base_url_falls_back_on_404():
     session = DummySession(DummyResponse(404, "Page not found"))
     resolved = resolve_source_base_url(session, source, timeout=10, hub_cache=hub_cache)
     assert resolved == "https://www.justice.gov/epstein/foia-records"
+
+
+def test_response_is_not_found_scans_html_bodies():
+    assert response_is_not_found(DummyResponse(404))
+    assert response_is_not_found(DummyResponse(200, "<title>Error 404</title>"))
+    assert response_is_not_found(DummyResponse(200, "<html>" + " " * 5000 + "<h1>Page Not Found</h1>"))
+    assert not response_is_not_found(DummyResponse(200, "<html>" + " " * 5000 + "404"))
+    assert not response_is_not_found(DummyResponse(200, "Page not found", content_type="application/pdf"))
+
+    huge = DummyResponse(200, "Page not found")
+    huge.headers["Content-Length"] = str(NOT_FOUND_SCAN_MAX_BYTES + 1)
+    assert not response_is_not_found(huge)
+
+
+def test_hub_lock_is_not_held_for_the_configured_url_probe():
+    source = SourceConfig(
+        id="doj-foia",
+        name="DOJ Epstein Library — FOIA",
+        base_url="https://www.justice.gov/epstein/foia",
+        discovery={"type": "doj_foia", "hub_url": "https://www.justice.gov/epstein", "hub_target": "foia"},
+        is_official=True,
+        notes="",
+        constraints="",
+        release_date="",
+        tags=[],
+    )
+    hub_cache = {"https://www.justice.gov/epstein": {"foia": "https://www.justice.gov/epstein/foia-records"}}
+    hub_lock = threading.Lock()
+
+    class ProbeSession(DummySession):
+        def get(self, *args, **kwargs):
+            # Other sources can use the hub cache while this probe is in flight
+            assert not hub_lock.locked()
+            return super().get(*args, **kwargs)
+
+    session = ProbeSession(DummyResponse(200, "<html></html>"))
+    resolved = resolve_source_base_url(session, source, timeout=10, hub_cache=hub_cache, hub_lock=hub_lock)
+    assert resolved == "https://www.justice.gov/epstein/foia-records"
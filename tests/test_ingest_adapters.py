@@ -1,7 +1,11 @@
+import threading
 from pathlib import Path
 
-from scripts.doj_hub import collect_links
-from scripts.ingest import DojCourtRecordsAdapter, DojFoiaAdapter, DojHubAdapter, SourceConfig
+import pytest
+
+from scripts import doj_hub
+from scripts.doj_hub import collect_links, collect_links_stream
+from scripts.ingest import DojCourtRecordsAdapter, DojFoiaAdapter, DojHubAdapter, RateLimiter, RequestContext, SourceConfig
 
 
 def test_court_records_adapter_parses_links():
@@ -36,6 +40,34 @@ def test_court_records_adapter_parses_links():
     assert "/multimedia/" in files[0].url
 
 
+def test_collect_links_stream_matches_collect_links():
+    fixture = Path("tests/fixtures/doj_court_records.html").read_text(encoding="utf-8")
+    fixture = fixture.replace("</h2>", " — Fülle &amp; Co</h2>", 1)
+    body = fixture.encode("utf-8")
+
+    class StreamResp:
+        encoding = "utf-8"
+
+        def __init__(self, size):
+            self.size = size
+
+        def iter_content(self, chunk_size):
+            return (body[i : i + self.size] for i in range(0, len(body), self.size))
+
+    # Small chunks split tags, entities, headings and multi-byte characters
+    for size in (1, 2, 3, 7, 64, len(body)):
+        assert collect_links_stream(StreamResp(size)) == collect_links(fixture)
+
+
+@pytest.mark.skipif(not doj_hub.HAS_LXML, reason="lxml not installed")
+def test_collect_links_lxml_matches_html_parser(monkeypatch):
+    pages = [path.read_text(encoding="utf-8") for path in sorted(Path("tests/fixtures").glob("*.html"))]
+    pages.append("<h2>A <b>B</b>\n C</h2><!-- note --><a href='z'> x <i>y</i> &amp; z </a>")
+    with_lxml = [collect_links(page) for page in pages]
+    monkeypatch.setattr(doj_hub, "HAS_LXML", False)
+    assert with_lxml == [collect_links(page) for page in pages]
+
+
 def test_hub_adapter_parses_links():
     fixture = Path("tests/fixtures/doj_hub.html").read_text(encoding="utf-8")
     source = SourceConfig(
@@ -55,10 +87,14 @@ def test_hub_adapter_parses_links():
     class DummyResp:
         text = fixture
         status_code = 200
+        encoding = "utf-8"
 
         def raise_for_status(self):
             return None
 
+        def iter_content(self, chunk_size):
+            return iter([fixture.encode("utf-8")])
+
     class DummySession:
         def get(self, *args, **kwargs):
             return DummyResp()
@@ -89,10 +125,14 @@ def test_foia_adapter_parses_multimedia_links():
     class DummyResp:
         text = fixture
         status_code = 200
+        encoding = "utf-8"
 
         def raise_for_status(self):
             return None
 
+        def iter_content(self, chunk_size):
+            return iter([fixture.encode("utf-8")])
+
     class HeadResp:
         status_code = 200
         headers = {"Content-Type": "application/pdf"}
@@ -110,3 +150,105 @@ def test_foia_adapter_parses_multimedia_links():
     assert any(url.endswith("/multimedia/foia/release-1") for url in urls)
     assert any(url.endswith("/multimedia/foia/audio-1") for url in urls)
     assert any(url.endswith("/multimedia/foia/opaque") for url in urls)
+
+
+def test_multimedia_head_probes_run_concurrently():
+    links = [
+        {"href": f"/multimedia/foia/opaque-{index}", "text": "Download", "heading": ""}
+        for index in range(4)
+    ]
+    links.append({"href": "/multimedia/foia/opaque-0", "text": "Again", "heading": ""})
+    links.append({"href": "/multimedia/foia/named", "text": "named.pdf", "heading": ""})
+    source = SourceConfig(
+        id="doj-epstein-foia",
+        name="DOJ Epstein Library — FOIA",
+        base_url="https://www.justice.gov/epstein/foia",
+        discovery={"type": "doj_foia"},
+        is_official=True,
+        notes="",
+        constraints="",
+        release_date="",
+        tags=["foia"],
+    )
+    config = {"defaults": {"allowed_extensions": [".pdf"], "ignore_extensions": [], "max_concurrency": 2}}
+    adapter = DojFoiaAdapter(source, config)
+    # Both workers must be inside a HEAD at the same time for the barrier to release
+    barrier = threading.Barrier(2, timeout=5)
+    probed = []
+
+    class HeadResp:
+        status_code = 200
+
+        def __init__(self, url):
+            content_type = "text/html" if url.endswith("opaque-3") else "application/pdf"
+            self.headers = {"Content-Type": content_type}
+
+    class DummySession:
+        def head(self, url, **kwargs):
+            probed.append(url)
+            barrier.wait()
+            return HeadResp(url)
+
+    content_types = adapter._probe_content_types(DummySession(), links, source.base_url, {})
+    assert sorted(probed) == sorted(content_types) == [
+        f"https://www.justice.gov/multimedia/foia/opaque-{index}" for index in range(4)
+    ]
+    included = [
+        adapter._should_include_link(DummySession(), url, "Download", {}, content_types)
+        for url in content_types
+    ]
+    assert included == [True, True, True, False]
+    assert len(probed) == 4
+
+
+def test_court_records_probes_each_link_once_across_pages():
+    pages = {
+        "https://www.justice.gov/epstein/court-records": (
+            "<h2>Cases</h2>"
+            "<a href='/epstein/court-records/maxwell'>See files at Maxwell</a>"
+            "<a href='/multimedia/court/opaque'>Download</a>"
+        ),
+        "https://www.justice.gov/epstein/court-records/maxwell": (
+            "<h2>United States v. Maxwell (2021)</h2><a href='/multimedia/court/opaque'>Download</a>"
+        ),
+    }
+    source = SourceConfig(
+        id="doj-epstein-court-records",
+        name="DOJ Epstein Library — Court Records",
+        base_url="https://www.justice.gov/epstein/court-records",
+        discovery={"type": "doj_court_records"},
+        is_official=True,
+        notes="",
+        constraints="",
+        release_date="",
+        tags=["court-records"],
+    )
+    config = {"defaults": {"allowed_extensions": [".pdf"], "ignore_extensions": []}}
+    requester = RequestContext(timeout=5, retry_max=0, backoff_base=0, limiter=RateLimiter(0), head_cache={})
+    adapter = DojCourtRecordsAdapter(source, config, requester=requester)
+    heads = []
+
+    class PageResp:
+        status_code = 200
+        encoding = "utf-8"
+
+        def __init__(self, url):
+            self.url = url
+            self.headers = {"Content-Type": "application/pdf"}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            return iter([pages[self.url].encode("utf-8")])
+
+    class DummySession:
+        def request(self, method, url, **kwargs):
+            if method == "HEAD":
+                heads.append(url)
+            return PageResp(url)
+
+    files = adapter.discover(DummySession())
+    # Listed on both pages, but the page walk HEADs it once through the run's cache
+    assert heads == ["https://www.justice.gov/multimedia/court/opaque"]
+    assert {file.url for file in files} == {"https://www.justice.gov/multimedia/court/opaque"}
@@ -1,6 +1,10 @@
 import json
+import threading
+import time
 from pathlib import Path
 
+import requests
+
 import scripts.ingest as ingest
 
 
@@ -56,7 +60,7 @@ def test_ingest_resumes_without_redownload(tmp_path, monkeypatch):
 
     downloads = {"count": 0}
 
-    def fake_download(session, url, dest, timeout, headers=None, retry_max=0, backoff_base=0, limiter=None):
+    def fake_download(session, url, dest, timeout, headers=None, **kwargs):
         downloads["count"] += 1
         dest.write_bytes(url.encode("utf-8"))
         return ingest.DownloadResult(
@@ -71,9 +75,9 @@ def test_ingest_resumes_without_redownload(tmp_path, monkeypatch):
     monkeypatch.setattr(ingest, "load_config", lambda: config)
     monkeypatch.setattr(ingest, "adapter_for", lambda source, cfg, requester=None: FakeAdapter(source, cfg))
     monkeypatch.setattr(ingest, "download_file", fake_download)
-    monkeypatch.setattr(ingest, "estimate_size", lambda *args, **kwargs: None)
     monkeypatch.setattr(ingest, "CONFIG_PATH", tmp_path / "config.json")
     monkeypatch.setattr(ingest, "STATE_PATH", tmp_path / "data/meta/ingest_state.json")
+    monkeypatch.setattr(ingest, "HEAD_CACHE_PATH", tmp_path / ".cache/ingest/head_cache.json")
     monkeypatch.setattr(ingest, "RAW_DIR", tmp_path / "data/raw")
 
     ingest.ingest()
@@ -83,3 +87,181 @@ def test_ingest_resumes_without_redownload(tmp_path, monkeypatch):
 
     ingest.ingest()
     assert downloads["count"] == 2
+
+
+def discovered_file(url, title="Doc"):
+    return ingest.DiscoveredFile(url=url, title=title, source_page="", release_date="", tags=[])
+
+
+def pdf_result(url, size, etag="", **fields):
+    return ingest.DownloadResult(
+        size=size,
+        content_type="application/pdf",
+        content_disposition="",
+        final_url=url,
+        etag=etag,
+        last_modified="",
+        **fields,
+    )
+
+
+def patch_ingest(tmp_path, monkeypatch, discover, download, source_ids=("dummy",)):
+    """Point ingest() at tmp_path with fake sources and downloads.
+
+    Args:
+        discover: source -> list of DiscoveredFile, called by each source's adapter.
+        download: (url, dest, headers) -> DownloadResult, standing in for download_file.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data/meta").mkdir(parents=True, exist_ok=True)
+    config = {
+        "defaults": {"timeout_seconds": 5, "requests_per_second": 0, "retry_max": 0, "backoff_base_seconds": 0},
+        "limits": {"local": {}},
+        "sources": [
+            {
+                "id": source_id,
+                "name": "Dummy",
+                "base_url": "https://example.test",
+                "discovery": {"type": "dummy"},
+                "is_official": True,
+                "notes": "",
+                "constraints": "",
+                "release_date": "2026-01-01",
+            }
+            for source_id in source_ids
+        ],
+    }
+
+    class FakeAdapter:
+        def __init__(self, source):
+            self.source = source
+
+        def discover(self, session):
+            return discover(self.source)
+
+    def fake_download(session, url, dest, timeout, headers=None, **kwargs):
+        return download(url, dest, headers)
+
+    monkeypatch.setattr(ingest, "load_config", lambda: config)
+    monkeypatch.setattr(ingest, "adapter_for", lambda source, cfg, requester=None: FakeAdapter(source))
+    monkeypatch.setattr(ingest, "download_file", fake_download)
+    monkeypatch.setattr(ingest, "STATE_PATH", tmp_path / "data/meta/ingest_state.json")
+    monkeypatch.setattr(ingest, "HEAD_CACHE_PATH", tmp_path / ".cache/ingest/head_cache.json")
+    monkeypatch.setattr(ingest, "RAW_DIR", tmp_path / "data/raw")
+
+
+def read_meta(tmp_path, name):
+    return json.loads((tmp_path / "data/meta" / name).read_text(encoding="utf-8"))
+
+
+def test_parallel_downloads_record_in_discovery_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPPIE_MAX_CONCURRENCY", "4")
+    monkeypatch.setenv("EPPIE_MAX_DOWNLOADS_PER_SOURCE", "3")
+    urls = [f"https://example.test/{name}.pdf" for name in "abcdef"]
+
+    def download(url, dest, headers):
+        # Later files finish first
+        time.sleep(0.01 * (len(urls) - urls.index(url)))
+        if url.endswith("b.pdf"):
+            resp = requests.Response()
+            resp.status_code = 404
+            raise requests.HTTPError(response=resp)
+        dest.write_bytes(url.encode("utf-8"))
+        return pdf_result(url, len(url))
+
+    patch_ingest(tmp_path, monkeypatch, lambda source: [discovered_file(url, url[-5]) for url in urls], download)
+    ingest.ingest()
+
+    catalog = read_meta(tmp_path, "catalog.json")
+    assert [entry["source_url"] for entry in catalog] == [urls[0], urls[2], urls[3]]
+    state = read_meta(tmp_path, "ingest_state.json")
+    assert state["dummy"]["cursor"] == 4
+    assert state["dummy"]["seen_urls"] == [urls[0], urls[2], urls[3]]
+    assert list(state["dummy"]["failed_urls"]) == [urls[1]]
+
+
+def test_sources_are_discovered_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPPIE_MAX_CONCURRENCY", "2")
+    # Each discovery waits for the other, so a serial run would time out
+    barrier = threading.Barrier(2, timeout=5)
+
+    def discover(source):
+        barrier.wait()
+        return [discovered_file(f"https://example.test/{source.id}.pdf", source.id)]
+
+    def download(url, dest, headers):
+        dest.write_bytes(url.encode("utf-8"))
+        return pdf_result(url, len(url))
+
+    patch_ingest(tmp_path, monkeypatch, discover, download, source_ids=("first", "second"))
+    ingest.ingest()
+
+    catalog = read_meta(tmp_path, "catalog.json")
+    assert [entry["title"] for entry in catalog] == ["first", "second"]
+
+
+def test_revalidates_only_files_still_on_disk(tmp_path, monkeypatch):
+    sent = []
+
+    def download(url, dest, headers):
+        sent.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            return pdf_result(url, 0, etag='"v1"', not_modified=True)
+        dest.write_bytes(b"%PDF-1.4 same bytes")
+        return pdf_result(url, 19, etag='"v1"')
+
+    patch_ingest(tmp_path, monkeypatch, lambda source: [discovered_file("https://example.test/a.pdf")], download)
+
+    def rerun():
+        # Forget seen URLs so the next run fetches again
+        (tmp_path / "data/meta/ingest_state.json").unlink()
+        ingest.ingest()
+
+    ingest.ingest()
+    (raw_file,) = (tmp_path / "data/raw").rglob("*.pdf")
+    rerun()
+    assert sent == [None, '"v1"']
+
+    raw_file.unlink()
+    rerun()
+    assert sent == [None, '"v1"', None]
+    assert raw_file.read_bytes() == b"%PDF-1.4 same bytes"
+
+
+def test_pdf_pages_are_counted_in_download_workers(tmp_path, monkeypatch):
+    def download(url, dest, headers):
+        dest.write_bytes(b"%PDF-1.4 body")
+        return pdf_result(url, 13, head=b"%PDF-1.4 body")
+
+    counted_on = []
+
+    def fake_count(path):
+        counted_on.append(threading.current_thread())
+        return 7
+
+    patch_ingest(tmp_path, monkeypatch, lambda source: [discovered_file("https://example.test/a.pdf")], download)
+    monkeypatch.setattr(ingest, "count_pdf_pages", fake_count)
+    ingest.ingest()
+
+    assert read_meta(tmp_path, "catalog.json")[0]["pages"] == 7
+    assert len(counted_on) == 1
+    assert counted_on[0] is not threading.main_thread()
+
+
+def test_no_discovery_starts_once_the_time_budget_is_spent(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPPIE_MAX_CONCURRENCY", "1")
+    monkeypatch.setenv("EPPIE_TIME_BUDGET_SECONDS", "0.1")
+    discovered = []
+
+    def discover(source):
+        discovered.append(source.id)
+        time.sleep(0.3)
+        return [discovered_file(f"https://example.test/{source.id}.pdf")]
+
+    def download(url, dest, headers):
+        raise AssertionError("the run is out of time before any download")
+
+    patch_ingest(tmp_path, monkeypatch, discover, download, source_ids=("first", "second"))
+    ingest.ingest()
+
+    assert discovered == ["first"]
@@ -1,6 +1,6 @@
 import os
 
-from scripts.ingest import load_config, select_limits
+from scripts.ingest import load_config, select_limits, select_pool_sizes
 
 
 def test_no_cap_by_default(monkeypatch):
@@ -18,3 +18,14 @@ def test_env_cap_overrides(monkeypatch):
     limits = select_limits(load_config())
     assert limits["max_docs"] == 5
     assert limits["max_bytes_run"] == 1000
+
+
+def test_pool_sizes_leave_room_beyond_concurrency(monkeypatch):
+    monkeypatch.delenv("EPPIE_POOL_CONNECTIONS", raising=False)
+    monkeypatch.delenv("EPPIE_POOL_MAXSIZE", raising=False)
+    monkeypatch.setenv("EPPIE_MAX_CONCURRENCY", "8")
+    assert select_pool_sizes({}) == {"connections": 10, "maxsize": 16}
+
+    monkeypatch.setenv("EPPIE_POOL_CONNECTIONS", "3")
+    monkeypatch.setenv("EPPIE_POOL_MAXSIZE", "4")
+    assert select_pool_sizes({}) == {"connections": 3, "maxsize": 4}